@@ -43,7 +43,9 @@ from temple.compiler.types import (
     UnionType,
 )
 from temple.template_spans import (
-    build_template_metadata,
+    TemplateTokenSpan,
+    build_token_span_index,
+    build_token_spans,
     build_unclosed_span,
 )
 
@@ -104,45 +106,45 @@ def _range_from_offsets(text: str, start: int, end: int) -> Range:
     )
 
 
+def _template_span(text: str, token_span: TemplateTokenSpan) -> _TemplateSpan:
+    return _TemplateSpan(
+        start=token_span.start_offset,
+        end=token_span.end_offset,
+        content_start=token_span.content_start_offset,
+        content_end=token_span.content_end_offset,
+        content=text[token_span.content_start_offset : token_span.content_end_offset],
+    )
+
+
 def _build_spans_by_type(text: str) -> dict[str, list[_TemplateSpan]]:
     spans_by_type: dict[str, list[_TemplateSpan]] = {
         "expression": [],
         "statement": [],
     }
-    token_spans, _ = build_template_metadata(text)
+    token_spans = build_token_spans(text)
     for token_span in token_spans:
         token_type = token_span.token.type
         if token_type not in spans_by_type:
             continue
-        spans_by_type[token_type].append(
-            _TemplateSpan(
-                start=token_span.start_offset,
-                end=token_span.end_offset,
-                content_start=token_span.content_start_offset,
-                content_end=token_span.content_end_offset,
-                content=text[
-                    token_span.content_start_offset : token_span.content_end_offset
-                ],
-            )
-        )
+        spans_by_type[token_type].append(_template_span(text, token_span))
     return spans_by_type
 
 
-def _find_span_at_offset(spans: list[_TemplateSpan], offset: int) -> _TemplateSpan | None:
-    for span in spans:
-        if span.content_start <= offset <= span.content_end:
-            return span
-    return None
+def _find_span_at_offset(text: str, offset: int, token_type: str) -> _TemplateSpan | None:
+    # Bisect the cached per-type index instead of scanning every span
+    token_span = build_token_span_index(text).find(offset, token_type)
+    if token_span is None:
+        return None
+    return _template_span(text, token_span)
 
 
 def _find_active_span_with_unclosed_support(
     text: str,
     offset: int,
     token_type: str,
-    spans: list[_TemplateSpan],
 ) -> _TemplateSpan | None:
     """Find a closed or active-unclosed token span at the given offset."""
-    closed_span = _find_span_at_offset(spans, offset)
+    closed_span = _find_span_at_offset(text, offset, token_type)
     if closed_span is not None:
         return closed_span
 
@@ -265,8 +267,7 @@ def _context_type_name(value: Any) -> str:
 
 def _extract_variable_reference(text: str, position: Position) -> VariableReference | None:
     offset = _position_to_offset(text, position)
-    spans_by_type = _build_spans_by_type(text)
-    expr_span = _find_span_at_offset(spans_by_type["expression"], offset)
+    expr_span = _find_span_at_offset(text, offset, "expression")
     if expr_span is None:
         return None
 
@@ -328,14 +329,8 @@ class TemplateCompletionProvider:
     ) -> CompletionList:
         items: dict[str, CompletionItem] = {}
         offset = _position_to_offset(text, position)
-        spans_by_type = _build_spans_by_type(text)
 
-        expr_span = _find_active_span_with_unclosed_support(
-            text,
-            offset,
-            "expression",
-            spans_by_type["expression"],
-        )
+        expr_span = _find_active_span_with_unclosed_support(text, offset, "expression")
 
         if expr_span is not None:
             expr_prefix = expr_span.content[: max(0, offset - expr_span.content_start)]
@@ -371,12 +366,7 @@ class TemplateCompletionProvider:
                                 ),
                             )
 
-        stmt_span = _find_active_span_with_unclosed_support(
-            text,
-            offset,
-            "statement",
-            spans_by_type["statement"],
-        )
+        stmt_span = _find_active_span_with_unclosed_support(text, offset, "statement")
         if stmt_span is not None:
             stmt_prefix = stmt_span.content[: max(0, offset - stmt_span.content_start)].strip()
             stmt_token_match = re.search(r"([A-Za-z_]*)$", stmt_prefix)
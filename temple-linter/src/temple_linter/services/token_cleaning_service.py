@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import re
-
 from temple.template_spans import TemplateLineMetadata, build_template_metadata
 from temple.template_tokenizer import Token
 from temple.whitespace_control import trim_leading_whitespace
@@ -12,7 +10,7 @@ from .base_cleaning_contract import BaseCleaningContract
 from .base_cleaning_policies import apply_markdown_policy
 from .projection_snapshot import ProjectionSnapshot
 
-_LEADING_HORIZONTAL_WHITESPACE_RE = re.compile(r"^[ \t]+")
+_HORIZONTAL_WHITESPACE = " \t"
 
 
 class TokenCleaningService:
@@ -79,7 +77,7 @@ class TokenCleaningService:
                 text_start = token_span.start_offset
                 if trim_next_text_left:
                     if preserve_line_structure:
-                        trimmed = _LEADING_HORIZONTAL_WHITESPACE_RE.sub("", text_value)
+                        trimmed = text_value.lstrip(_HORIZONTAL_WHITESPACE)
                     else:
                         trimmed = trim_leading_whitespace(text_value)
                     removed = len(text_value) - len(trimmed)
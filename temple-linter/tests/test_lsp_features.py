@@ -117,6 +117,29 @@ def test_hover_shows_type_and_description() -> None:
     assert "Display name" in hover.contents.value
 
 
+def test_hover_finds_later_expression_among_many() -> None:
+    schema, raw_schema = _semantic_schema()
+    provider = TemplateHoverProvider()
+    text = "{{ user.email }} {% if user %}x{% end %}\n{{ user.email }} {{ user.name }}"
+
+    hover = provider.get_hover(
+        text,
+        Position(line=1, character=25),
+        schema=schema,
+        raw_schema=raw_schema,
+    )
+    assert hover is not None
+    assert "Display name" in hover.contents.value
+
+    between = provider.get_hover(
+        text,
+        Position(line=1, character=16),
+        schema=schema,
+        raw_schema=raw_schema,
+    )
+    assert between is None
+
+
 def test_definition_resolves_include_file(tmp_path: Path) -> None:
     main_file = tmp_path / "templates" / "main.html.tmpl"
     include_file = tmp_path / "templates" / "includes" / "header.html.tmpl"
@@ -13,10 +13,11 @@ from temple.filter_registry import (
     FilterAdapter,
     FilterSignature,
 )
-from temple.lark_parser import parse_template, parse_with_diagnostics
+from temple.lark_parser import parse_many, parse_template, parse_with_diagnostics
 from temple.template_renderer import (
     BlockValidator,
     RenderError,
+    clear_render_cache,
     render,
     render_passthrough,
 )
@@ -28,9 +29,11 @@ __all__ = [
     "temple_tokenizer",
     "render",
     "render_passthrough",
+    "clear_render_cache",
     "RenderError",
     "BlockValidator",
     "parse_template",
+    "parse_many",
     "parse_with_diagnostics",
     "FilterAdapter",
     "FilterSignature",
@@ -24,7 +24,7 @@ from enum import Enum
 from .range_utils import make_source_range
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Position(Sequence[int]):
     """Position in source text (0-indexed).
 
@@ -77,7 +77,7 @@ class Position(Sequence[int]):
         return tuple(vals[start:stop:step])
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SourceRange(Sequence["Position"]):
     """Range in source text.
 
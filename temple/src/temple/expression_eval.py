@@ -11,7 +11,9 @@ from __future__ import annotations
 
 import ast
 import re
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Any
 
 from temple.filter_registry import DEFAULT_FILTER_ADAPTER
@@ -33,23 +35,81 @@ def is_simple_path(expr: str) -> bool:
 
 def resolve_simple_path(path: str, context: dict[str, Any] | None) -> Any:
     """Resolve a dot path in dictionaries/lists with graceful missing handling."""
-    if context is None:
-        return None
+    return _compile_path(path)(context)
+
+
+def _lookup_root(context: Any, head: str) -> Any:
+    """Resolve the first path segment against a context of any type."""
+    if isinstance(context, Mapping):
+        return context.get(head)
+    if isinstance(context, (list, tuple)) and head.isdecimal():
+        idx = int(head)
+        return context[idx] if idx < len(context) else None
+    return None
+
+
+def _segment_getter(part: str) -> Callable[[Any], Any]:
+    """Return a getter for one dot-path segment below the context root."""
+    if not part.isdecimal():
+
+        def get_key(value: Any) -> Any:
+            return value.get(part) if isinstance(value, dict) else None
+
+        return get_key
+
+    idx = int(part)
 
-    value: Any = context
-    for part in path.split("."):
+    def get_index(value: Any) -> Any:
         if isinstance(value, dict):
-            value = value.get(part)
-        elif isinstance(value, (list, tuple)):
-            if not part.isdigit():
-                return None
-            idx = int(part)
-            if idx < 0 or idx >= len(value):
+            return value.get(part)
+        if isinstance(value, (list, tuple)):
+            return value[idx] if idx < len(value) else None
+        return None
+
+    return get_index
+
+
+@lru_cache(maxsize=1024)
+def _compile_path(path: str) -> Callable[[dict[str, Any] | None], Any]:
+    """Compile a dot path into a resolver chaining one getter per segment."""
+    head, *rest = path.split(".")
+    if not rest:
+
+        def resolve_head(context: dict[str, Any] | None) -> Any:
+            if isinstance(context, dict):
+                return context.get(head)
+            return _lookup_root(context, head)
+
+        return resolve_head
+
+    if not any(part.isdecimal() for part in rest):
+        # Pure key paths walk dicts inline, without a getter call per segment
+        keys = tuple(rest)
+
+        def resolve_keys(context: dict[str, Any] | None) -> Any:
+            value = (
+                context.get(head) if isinstance(context, dict) else _lookup_root(context, head)
+            )
+            for key in keys:
+                if not isinstance(value, dict):
+                    return None
+                value = value.get(key)
+            return value
+
+        return resolve_keys
+
+    getters = tuple(_segment_getter(part) for part in rest)
+
+    def resolve(context: dict[str, Any] | None) -> Any:
+        # Dict contexts (including For loop scopes) take the direct lookup
+        value = context.get(head) if isinstance(context, dict) else _lookup_root(context, head)
+        for get in getters:
+            if value is None:
                 return None
-            value = value[idx]
-        else:
-            return None
-    return value
+            value = get(value)
+        return value
+
+    return resolve
 
 
 @dataclass(frozen=True)
@@ -264,48 +324,137 @@ class _ExpressionEvaluator:
         return True
 
 
-def _evaluate_base_expression(expr: str, context: dict[str, Any] | None) -> Any:
+# Compiled base expression: resolves its value from a render context
+_CompiledBase = Callable[[dict[str, Any] | None], Any]
+
+
+def _resolve_none(context: dict[str, Any] | None) -> Any:
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _ResolveConstant:
+    """Compiled base for a literal such as ``1`` or ``'draft'``."""
+
+    value: Any
+
+    def __call__(self, context: dict[str, Any] | None) -> Any:
+        return self.value
+
+
+def constant_value(resolve: _CompiledBase) -> tuple[bool, Any]:
+    """Return ``(True, value)`` if ``resolve`` yields ``value`` for every context.
+
+    ``resolve`` is a callable from ``expression_resolver``; expressions with
+    filters or context lookups are never reported as constant.
+    """
+    if resolve is _resolve_none:
+        return True, None
+    if isinstance(resolve, _ResolveConstant):
+        return True, resolve.value
+    return False, None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledExpression:
+    """Expression parsed once (pipeline, paths, AST) for repeated evaluation."""
+
+    base: _CompiledBase
+    filters: tuple[tuple[str, tuple[_CompiledBase, ...]], ...]
+
+
+def _compile_ast(body: ast.expr) -> _CompiledBase:
+    def resolve(context: dict[str, Any] | None) -> Any:
+        evaluator = _ExpressionEvaluator(context or {})
+        try:
+            return evaluator.eval(body)
+        except Exception:
+            return None
+
+    return resolve
+
+
+def _compile_base_expression(expr: str | None) -> _CompiledBase:
     if expr is None:
-        return None
+        return _resolve_none
 
     stripped = expr.strip()
     if not stripped:
-        return None
+        return _resolve_none
 
     if is_simple_path(stripped):
-        return resolve_simple_path(stripped, context)
+        return _compile_path(stripped)
 
     try:
         parsed = ast.parse(normalize_expression(stripped), mode="eval")
     except Exception:
-        return None
+        return _resolve_none
+    if isinstance(parsed.body, ast.Constant):
+        # Literals are folded once instead of walking the AST per evaluation
+        return _ResolveConstant(parsed.body.value)
+    return _compile_ast(parsed.body)
 
-    evaluator = _ExpressionEvaluator(context or {})
-    try:
-        return evaluator.eval(parsed.body)
-    except Exception:
-        return None
 
+_EMPTY_EXPRESSION = CompiledExpression(base=_resolve_none, filters=())
 
-def evaluate_expression(expr: str | None, context: dict[str, Any] | None) -> Any:
-    """Evaluate an expression against context. Returns None on unsupported/invalid input."""
+
+@lru_cache(maxsize=1024)
+def _compile_expression_cached(stripped: str) -> CompiledExpression:
+    base_expr, filters = parse_filter_pipeline(stripped)
+    return CompiledExpression(
+        base=_compile_base_expression(base_expr),
+        filters=tuple(
+            (
+                filter_call.name,
+                tuple(_compile_base_expression(arg) for arg in filter_call.args),
+            )
+            for filter_call in filters
+        ),
+    )
+
+
+def compile_expression(expr: str | None) -> CompiledExpression:
+    """Parse an expression once so it can be evaluated repeatedly."""
     if expr is None:
-        return None
+        return _EMPTY_EXPRESSION
 
     stripped = expr.strip()
     if not stripped:
-        return None
-
-    base_expr, filters = parse_filter_pipeline(stripped)
-    value = _evaluate_base_expression(base_expr, context)
-    for filter_call in filters:
-        args = tuple(_evaluate_base_expression(arg, context) for arg in filter_call.args)
-        value = DEFAULT_FILTER_ADAPTER.apply(value, filter_call.name, args)
-        if value is None and not DEFAULT_FILTER_ADAPTER.has_filter(filter_call.name):
+        return _EMPTY_EXPRESSION
+    return _compile_expression_cached(stripped)
+
+
+def evaluate_compiled_expression(
+    compiled: CompiledExpression,
+    context: dict[str, Any] | None,
+) -> Any:
+    """Evaluate a compiled expression against context (see ``evaluate_expression``)."""
+    value = compiled.base(context)
+    for name, arg_bases in compiled.filters:
+        args = tuple(resolve(context) for resolve in arg_bases)
+        value = DEFAULT_FILTER_ADAPTER.apply(value, name, args)
+        if value is None and not DEFAULT_FILTER_ADAPTER.has_filter(name):
             return None
     return value
 
 
+def expression_resolver(expr: str | None) -> _CompiledBase:
+    """Return a callable evaluating ``expr`` against a context.
+
+    Filter-free expressions resolve through their compiled base directly,
+    skipping the pipeline loop in ``evaluate_compiled_expression``.
+    """
+    compiled = compile_expression(expr)
+    if not compiled.filters:
+        return compiled.base
+    return partial(evaluate_compiled_expression, compiled)
+
+
+def evaluate_expression(expr: str | None, context: dict[str, Any] | None) -> Any:
+    """Evaluate an expression against context. Returns None on unsupported/invalid input."""
+    return evaluate_compiled_expression(compile_expression(expr), context)
+
+
 def _path_from_node(node: ast.AST) -> str | None:
     if isinstance(node, ast.Name):
         return node.id
@@ -13,16 +13,23 @@ Grammar Strategy:
 # ============================================================================
 # Public API (matches production lark_parser.py)
 # ============================================================================
+import hashlib
 import os
 import re
-from collections.abc import Sequence
-from typing import Any, Literal, overload
+import sys
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal, cast, overload
 
 try:
     from lark import (
         Lark,
         Token,
         Transformer,
+        Transformer_NonRecursive,
         Tree,
         UnexpectedCharacters,
         UnexpectedInput,
@@ -62,6 +69,9 @@ except ModuleNotFoundError as exc:
         def __init__(self, *_args, **_kwargs):
             pass
 
+    class Transformer_NonRecursive(Transformer):  # type: ignore[no-redef]
+        """Minimal non-recursive transformer shim for typing/runtime import safety."""
+
     class Lark:  # type: ignore[no-redef]
         """Minimal parser shim for typing/runtime import safety."""
 
@@ -92,29 +102,34 @@ _EXPR_SCAN_RE = re.compile(
     rf"\{{\{{[{_TRIM_MARKER_CLASS}]?(.*?)[{_TRIM_MARKER_CLASS}]?\}}\}}",
     re.DOTALL,
 )
-_ELSE_IF_PREFIX_RE = re.compile(r"^(?:else\s+if|elif)\b(?P<condition>.*)$", re.IGNORECASE)
+_ELSE_IF_TAG_RE = re.compile(
+    rf"^\s*\{{%[{_TRIM_MARKER_CLASS}]?\s*(?:else\s+if|elif)\b(.*?)\s*[{_TRIM_MARKER_CLASS}]?%\}}\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_FOR_ARGS_RE = re.compile(r"([A-Za-z_]\w*)\s+in\s+(.+)")
+_SET_ARGS_RE = re.compile(r"([A-Za-z_]\w*)\s*=\s*(.+)", re.DOTALL)
+_QUOTES = ("'", '"')
 
 
 def _extract_else_if_condition(tag_text: str) -> str:
     """Extract else-if condition from compound ELSE_IF_TAG token text."""
-    text = tag_text.strip()
-    if text.startswith("{%"):
-        text = text[2:]
-    if text.endswith("%}"):
-        text = text[:-2]
-    text = text.strip()
-
-    if text and text[0] in TRIM_MARKERS:
-        text = text[1:].strip()
-    if text and text[-1] in TRIM_MARKERS:
-        text = text[:-1].strip()
-
-    match = _ELSE_IF_PREFIX_RE.match(text)
+    match = _ELSE_IF_TAG_RE.match(tag_text)
     if match:
-        return match.group("condition").strip()
+        return match.group(1).strip()
     return ""
 
 
+def _newline_offsets(text: str) -> list[int]:
+    """Return the offsets of every newline in text, in ascending order."""
+    offsets: list[int] = []
+    pos = text.find("\n")
+    while pos >= 0:
+        offsets.append(pos)
+        pos = text.find("\n", pos + 1)
+    return offsets
+
+
 def _token_range(tk: Token) -> SourceRange:
     """Extract SourceRange from a Lark Token."""
     start = Position(tk.line - 1, tk.column - 1)
@@ -127,9 +142,13 @@ def _make_empty_range() -> SourceRange:
     return SourceRange(Position(0, 0), Position(0, 0))
 
 
+@lru_cache(maxsize=1024)
 def _validate_expression_syntax(expr: str) -> tuple[bool, str]:
     """Validate expression syntax (dot notation, identifiers).
 
+    Results are cached per expression string: the pre-scan and the
+    transformer both validate every expression, and templates repeat them.
+
     Returns:
         (is_valid, error_message)
     """
@@ -137,11 +156,11 @@ def _validate_expression_syntax(expr: str) -> tuple[bool, str]:
         return True, ""  # Empty expressions are allowed
 
     # Check for trailing dot
-    if expr.endswith("."):
+    if expr[-1] == ".":
         return False, "Expression ends with trailing dot"
 
     # Check for leading dot
-    if expr.startswith("."):
+    if expr[0] == ".":
         return False, "Expression starts with leading dot"
 
     # Check for consecutive dots
@@ -155,18 +174,86 @@ def _validate_expression_syntax(expr: str) -> tuple[bool, str]:
     return True, ""
 
 
-GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), "typed_grammar.lark")
+GRAMMAR_PATH = Path(__file__).parent / "typed_grammar.lark"
+
+
+def _parser_cache_path(grammar: str) -> str | None:
+    """Return a per-user file for lark's pickled LALR tables, or None to skip it.
+
+    Lark unpickles the cache on load, so it must never live somewhere other
+    users can write (such as the shared temp directory). The file is kept in
+    a ``temple`` cache directory owned by the current user and not writable
+    by group or others; otherwise tables are rebuilt without a disk cache.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(base, "temple")
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        info = os.stat(cache_dir)
+    except OSError:
+        return None
+    if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+        return None
+    from lark import __version__ as lark_version
+
+    key = f"{grammar}{lark_version}{sys.version_info[:2]}".encode()
+    return os.path.join(cache_dir, f"lark-{hashlib.sha256(key).hexdigest()[:16]}.cache")
+
+
+def _build_parser(path: str, transformer: Transformer | None) -> Lark:
+    """Build the LALR parser for a grammar file and transformer.
+
+    The LALR tables are persisted in a per-user cache file (see
+    ``_parser_cache_path``), so new processes skip table generation; lark
+    verifies a hash of the grammar and options on load and rebuilds the
+    tables if the file is stale or unusable.
+    """
+    grammar = Path(path).read_text()
+    cache = _parser_cache_path(grammar) or False
+    return Lark(grammar, start="start", parser="lalr", transformer=transformer, cache=cache)
+
+
+@lru_cache(maxsize=4)
+def _shared_parser(path: str, fused: bool) -> Lark:
+    """Build the raw-tree or fused typed-AST parser once per grammar file.
+
+    Call ``clear_parser_cache()`` after editing the grammar to rebuild it in
+    a running process.
+    """
+    return _build_parser(path, _AST_TRANSFORMER if fused else None)
+
+
+def get_parser(transformer: Transformer | None = None) -> Lark:
+    """Return a Lark parser for the Temple grammar.
 
+    The raw-tree parser and the fused typed-AST parser are built once and
+    shared; a parser for any other transformer is built on each call.
 
-def get_parser() -> Lark:
-    """Load and return Lark parser for Temple grammar."""
+    Args:
+        transformer: Optional transformer applied during parsing; ``parse()``
+            then returns the transformed result instead of a raw Tree.
+    """
     if _LARK_IMPORT_ERROR is not None:
         raise ModuleNotFoundError(
             "temple parser dependency 'lark' is missing; install temple with parser requirements"
         ) from _LARK_IMPORT_ERROR
-    with open(GRAMMAR_PATH) as f:
-        grammar = f.read()
-    return Lark(grammar, start="start", parser="lalr")
+    if transformer is None or transformer is _AST_TRANSFORMER:
+        return _shared_parser(str(GRAMMAR_PATH), transformer is not None)
+    return _build_parser(str(GRAMMAR_PATH), transformer)
+
+
+def clear_parser_cache() -> None:
+    """Drop shared parsers so the next parse re-reads the grammar file."""
+    _shared_parser.cache_clear()
+
+
+def _get_ast_parser() -> Lark:
+    """Return the parser that builds typed AST nodes while parsing.
+
+    The baked-in transformer has no node collector, so it is stateless and
+    safe to share; callers that collect diagnostics use the Tree path.
+    """
+    return get_parser(transformer=_AST_TRANSFORMER)
 
 
 @overload
@@ -205,12 +292,52 @@ def parse_template(
     Raises:
         UnexpectedInput: On syntax errors (use parse_with_diagnostics for error collection)
     """
+    if not text and _LARK_IMPORT_ERROR is None:
+        # Empty input parses to an empty block
+        if include_raw:
+            return Block([]), Tree("start", [Tree("block", [])])
+        return Block([])
+
+    if not include_raw and node_collector is None:
+        # Transform while parsing; no intermediate Tree is needed
+        return cast(Block, _get_ast_parser().parse(text))
+
     parser = get_parser()
     tree = parser.parse(text)
-    transformer = _LarkToTypedASTTransformer(node_collector)
+    if node_collector is None:
+        transformer = _AST_TRANSFORMER
+    else:
+        transformer = _LarkToTypedASTTransformer(node_collector)
+    ast: Block = transformer.transform(tree)
     if not include_raw:
-        return transformer.transform(tree)
-    return (transformer.transform(tree), tree)
+        return ast
+    return (ast, tree)
+
+
+def parse_many(texts: Iterable[str], max_workers: int | None = None) -> list[Block]:
+    """Parse several templates with one shared, warm parser.
+
+    Args:
+        texts: Template source texts
+        max_workers: If set, parse on a thread pool of this size; results keep
+            the input order either way
+
+    Returns:
+        Parsed Block ASTs, one per input text
+
+    Raises:
+        UnexpectedInput: On the first syntax error (use parse_with_diagnostics
+            for error collection)
+    """
+    parse = _get_ast_parser().parse
+
+    def _parse(text: str) -> Block:
+        return cast(Block, parse(text)) if text else Block([])
+
+    if max_workers is None:
+        return [_parse(text) for text in texts]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_parse, texts))
 
 
 def parse_with_diagnostics(
@@ -238,21 +365,32 @@ def parse_with_diagnostics(
         )
         return Block([]), collector.diagnostics
 
+    if not text:
+        return Block([]), collector.diagnostics
+
     ast = None
 
     # First, scan for expression syntax errors directly from text
-    for match in _EXPR_SCAN_RE.finditer(text):
-        expr_text = match.group(1).strip()
-        is_valid, error_msg = _validate_expression_syntax(expr_text)
+    invalid_bodies: dict[str, str] = {}
+    for body in set(_EXPR_SCAN_RE.findall(text)):
+        is_valid, error_msg = _validate_expression_syntax(body.strip())
         if not is_valid:
+            invalid_bodies[body] = error_msg
+
+    if invalid_bodies:
+        newlines = _newline_offsets(text)
+        for match in _EXPR_SCAN_RE.finditer(text):
+            invalid_msg = invalid_bodies.get(match.group(1))
+            if invalid_msg is None:
+                continue
             # Calculate position
             start_offset = match.start()
-            lines_before = text[:start_offset].count("\n")
-            line_start = text.rfind("\n", 0, start_offset) + 1
+            lines_before = bisect_left(newlines, start_offset)
+            line_start = newlines[lines_before - 1] + 1 if lines_before else 0
             col = start_offset - line_start
 
             collector.add_error(
-                f"Invalid expression syntax: {error_msg}",
+                f"Invalid expression syntax: {invalid_msg}",
                 SourceRange(
                     Position(lines_before, col),
                     Position(lines_before, col + len(match.group())),
@@ -319,9 +457,12 @@ def parse_with_diagnostics(
         return Block([]), collector.diagnostics
 
 
-class _LarkToTypedASTTransformer(Transformer[Block]):
+class _LarkToTypedASTTransformer(Transformer_NonRecursive):
     """Internal transformer: Lark parse tree → Typed AST.
 
+    Walks raw trees iteratively, so deeply nested templates cannot exhaust the
+    Python stack; the fused parser path calls the same rule handlers directly.
+
     Handles:
     - text and expression nodes
     - if_stmt with else_if_chain and else_clause
@@ -348,9 +489,29 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
         return Text(_make_empty_range(), "")
 
     # Helper to extract content strings
+    def _extract_str_and_range(self, items: Sequence[Any]) -> tuple[str, SourceRange]:
+        """Extract string content and the first token's range in a single pass."""
+        args: str | None = None
+        first_token: Token | None = None
+        for it in items:
+            if isinstance(it, Token):
+                if first_token is None:
+                    first_token = it
+                if args is None:
+                    args = it.value.strip()
+            elif isinstance(it, str) and args is None:
+                args = it.strip()
+            if args is not None and first_token is not None:
+                break
+        src = _token_range(first_token) if first_token is not None else _make_empty_range()
+        return args or "", src
+
     def _extract_str(self, items: Sequence[Any]) -> str:
         """Extract string content from items (either Token or str)."""
         for it in items:
+            if isinstance(it, Token):
+                value: str = it.value
+                return value.strip()
             if isinstance(it, str):
                 return it.strip()
         return ""
@@ -376,12 +537,14 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
         content = ""
         src = _make_empty_range()
 
+        # Token subclasses str, so test it first
         for it in items:
-            if isinstance(it, str):
+            if isinstance(it, Token):
+                if it.type == "EXPR_CONTENT":
+                    content = it.value.strip()
+                    src = _token_range(it)
+            elif isinstance(it, str):
                 content = it
-            elif isinstance(it, Token) and getattr(it, "type", "") == "EXPR_CONTENT":
-                content = str(it).strip()
-                src = _token_range(it)
 
         is_valid, msg = _validate_expression_syntax(content)
         expr_node = Expression(src, content)
@@ -399,9 +562,12 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
         else_body: Block | None = None
         src = _make_empty_range()
 
-        # Extract components - Tokens inherit from str, so check Token first!
+        # Extract components and the first token for the source range
+        first_token: Token | None = None
         for it in items:
             if isinstance(it, str):
+                if first_token is None and isinstance(it, Token):
+                    first_token = it
                 if not cond:
                     cond = it
             elif isinstance(it, Block):
@@ -413,11 +579,8 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
                 # else_if_chain returns list
                 else_if_parts = it
 
-        # Try to get source range from first token
-        for it in items:
-            if isinstance(it, Token):
-                src = _token_range(it)
-                break
+        if first_token is not None:
+            src = _token_range(first_token)
 
         # print(f"DEBUG if_stmt returning: cond={cond!r}, body={body}, else_if_parts={else_if_parts}, else_body={else_body}")
         return If(
@@ -480,7 +643,7 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
         var = ""
         iterable = ""
         if loop_args_str:
-            m = re.match(r"([A-Za-z_]\w*)\s+in\s+(.+)", loop_args_str)
+            m = _FOR_ARGS_RE.match(loop_args_str)
             if m:
                 var = m.group(1)
                 iterable = m.group(2).strip()
@@ -489,29 +652,19 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
 
     # include_stmt: STMT_OPEN "include" include_args STMT_CLOSE
     def include_stmt(self, items: Sequence[Any]):
-        args = self._extract_str(items)
-        src = _make_empty_range()
-
-        for it in items:
-            if isinstance(it, Token):
-                src = _token_range(it)
-                break
+        args, src = self._extract_str_and_range(items)
 
-        # Strip surrounding quotes if present
-        name = re.sub(r"^\s*[\'\"]|[\'\"]\s*$", "", args)
+        # Strip surrounding quotes if present (args is already whitespace-stripped)
+        name = args[1:] if args.startswith(_QUOTES) else args
+        if name.endswith(_QUOTES):
+            name = name[:-1]
         return Include(src, name)
 
     # set_stmt: STMT_OPEN "set" set_args STMT_CLOSE
     def set_stmt(self, items: Sequence[Any]):
-        args = self._extract_str(items)
-        src = _make_empty_range()
-
-        for it in items:
-            if isinstance(it, Token):
-                src = _token_range(it)
-                break
+        args, src = self._extract_str_and_range(items)
 
-        m = re.match(r"([A-Za-z_]\w*)\s*=\s*(.+)", args, re.DOTALL)
+        m = _SET_ARGS_RE.match(args)
         if not m:
             if self.node_collector is not None:
                 self.node_collector.add_error(
@@ -539,30 +692,41 @@ class _LarkToTypedASTTransformer(Transformer[Block]):
     # block: (text | expression | if_stmt | for_stmt | include_stmt | set_stmt)*
     def block(self, items: Sequence[Any]) -> Block:
         """Wrap items in Block, filtering out None values."""
+        for it in items:
+            # None (from set_stmt), untransformed Trees and lists need filtering
+            if it is None or isinstance(it, (Tree, list)):
+                break
+        else:
+            # Every child is already a node
+            return Block(items)
+
         flattened: list[Any] = []
 
         for it in items:
-            # Skip None (from set_stmt or Tree objects)
-            if it is None or hasattr(it, "data"):
+            # Skip None (from set_stmt) and any untransformed Tree objects
+            if it is None or isinstance(it, Tree):
                 continue
             if isinstance(it, list):
                 flattened.extend(it)
             else:
                 flattened.append(it)
 
-        return Block(flattened) if flattened else Block([])
+        return Block(flattened)
 
     # start: block
     def start(self, items: Sequence[Any]) -> Block:
-        """Top-level rule wraps into Block."""
-        for it in items:
-            if isinstance(it, Block):
-                return it
-        return Block([])
+        """Top-level rule: ``start: block`` has exactly one child, the Block."""
+        block: Block = items[0]
+        return block
+
 
+# Shared collector-free transformer; it holds no per-parse state.
+_AST_TRANSFORMER = _LarkToTypedASTTransformer()
 
 __all__ = [
     "parse_template",
+    "parse_many",
     "parse_with_diagnostics",
     "get_parser",
+    "clear_parser_cache",
 ]
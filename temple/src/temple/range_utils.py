@@ -9,6 +9,28 @@ import warnings
 if TYPE_CHECKING:
     from .diagnostics import Position, SourceRange
 
+# Resolved on first use by _diagnostic_types(); diagnostics imports this module.
+_diagnostic_types_cache: tuple[type[Position], type[SourceRange]] | None = None
+
+
+def _diagnostic_types() -> tuple[type[Position], type[SourceRange]]:
+    """Return (Position, SourceRange), importing diagnostics only once."""
+    global _diagnostic_types_cache
+    if _diagnostic_types_cache is None:
+        from .diagnostics import Position, SourceRange  # local import
+
+        _diagnostic_types_cache = (Position, SourceRange)
+    return _diagnostic_types_cache
+
+
+def _int_pair(value: object, name: str) -> tuple[int, int]:
+    """Unpack a (line, column) tuple/list of two ints or raise TypeError."""
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        a, b = value
+        if isinstance(a, int) and isinstance(b, int):
+            return a, b
+    raise TypeError(f"{name} must be a tuple of two ints")
+
 
 class RangeLike(Protocol):
     start: "Position"
@@ -30,34 +52,16 @@ def make_source_range(
     Raises:
         TypeError or ValueError on invalid inputs.
     """
-    # Import types here to avoid circular import at module import time
-    from .diagnostics import Position, SourceRange  # local import
+    Position, SourceRange = _diagnostic_types()
 
-    # If already a SourceRange
+    # Fast path: already a SourceRange (the common case)
     if isinstance(source_range, SourceRange):
         return source_range
 
     # If start tuple provided, use it (end optional)
     if start is not None:
-        if not (
-            isinstance(start, (tuple, list))
-            and len(start) == 2
-            and isinstance(start[0], int)
-            and isinstance(start[1], int)
-        ):
-            raise TypeError("start must be a tuple of two ints")
-        s = Position(start[0], start[1])
-        if end is None:
-            e = s
-        else:
-            if not (
-                isinstance(end, (tuple, list))
-                and len(end) == 2
-                and isinstance(end[0], int)
-                and isinstance(end[1], int)
-            ):
-                raise TypeError("end must be a tuple of two ints")
-            e = Position(end[0], end[1])
+        s = Position(*_int_pair(start, "start"))
+        e = s if end is None else Position(*_int_pair(end, "end"))
         return SourceRange(s, e)
 
     # Allow duck-typed source_range-like objects for backward compatibility
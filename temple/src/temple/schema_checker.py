@@ -1,25 +1,74 @@
-from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+_PathMapping = list[tuple[str, tuple[int, int]]]
+
+# Python types accepted for each supported schema 'type'
+_TYPE_CHECKS: dict[str, Any] = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "boolean": bool,
+}
+_TYPE_MISMATCH_MSG = "expected {}, got {}"
+_REQUIRED_MISSING_MSG = "required property missing"
+
+
+class _MappingIndex:
+    """Path lookup structure built once per ``validate`` call.
+
+    ``first`` maps each path to its earliest (order, pos) in the mapping list;
+    ``paths`` holds the same keys sorted so descendants of a path form one
+    contiguous run that ``bisect`` can locate. ``resolved`` memoizes lookups,
+    since one node can report several diagnostics (e.g. missing properties).
+    """
+
+    __slots__ = ("first", "paths", "default", "resolved")
+
+    def __init__(self, mapping: _PathMapping):
+        first: dict[str, tuple[int, tuple[int, int]]] = {}
+        for order, (p, pos) in enumerate(mapping):
+            if p not in first:
+                first[p] = (order, pos)
+        self.first = first
+        self.paths = sorted(first)
+        self.default = mapping[0][1]
+        self.resolved: dict[str, tuple[int, int]] = {}
 
 
 def _find_node_pos(
-    mapping: Optional[List[Tuple[str, Tuple[int, int]]]],
+    index: Optional[_MappingIndex],
     preferred_path: Optional[str] = None,
 ):
-    if not mapping:
+    if index is None:
         return None
-    if preferred_path:
-        # mapping entries are (path, pos)
-        for p, pos in mapping:
-            if p == preferred_path or p.startswith(preferred_path + "/"):
-                return pos
-    # fallback to the first mapping entry's position
-    return mapping[0][1]
+    if not preferred_path:
+        # fallback to the first mapping entry's position
+        return index.default
+    pos = index.resolved.get(preferred_path)
+    if pos is None:
+        # Earliest mapping entry that is the path itself or one of its descendants
+        first = index.first
+        best = first.get(preferred_path)
+        prefix = preferred_path + "/"
+        paths = index.paths
+        end = len(paths)
+        i = bisect_left(paths, prefix)
+        while i < end and paths[i].startswith(prefix):
+            hit = first[paths[i]]
+            if best is None or hit[0] < best[0]:
+                best = hit
+            i += 1
+        pos = best[1] if best is not None else index.default
+        index.resolved[preferred_path] = pos
+    return pos
 
 
 def validate(
     ir: Any,
     schema: Dict[str, Any],
-    mapping: Optional[List[Tuple[str, Tuple[int, int]]]] = None,
+    mapping: Optional[_PathMapping] = None,
     path: str = "",
 ) -> List[Dict[str, Any]]:
     """Validate a Python IR against a minimal JSON-schema-like spec.
@@ -27,88 +76,62 @@ def validate(
     Supported schema keys: 'type' (object, array, string, number, boolean),
     'properties' (dict), 'required' (list), 'items' (schema).
 
+    Nested nodes are walked with an explicit work stack rather than recursion,
+    so deep IRs cost no extra Python frames and cannot hit the recursion limit.
+    Diagnostics come out in depth-first document order.
+
     Returns list of diagnostics: {path, message, node_pos}
     """
     diags: List[Dict[str, Any]] = []
+    work: list[tuple[Any, dict[str, Any], str]] = [(ir, schema, path)]
+    index = _MappingIndex(mapping) if mapping else None
+    find_pos = _find_node_pos
 
-    t = schema.get("type")
-    if t == "object":
-        if not isinstance(ir, dict):
-            diags.append(
-                {
-                    "path": path or "/",
-                    "message": f"expected object, got {type(ir).__name__}",
-                    "node_pos": _find_node_pos(mapping, path or "/"),
-                }
-            )
-            return diags
-        # required
-        for req in schema.get("required", []):
-            if req not in ir:
-                diags.append(
-                    {
-                        "path": f"{path}/{req}",
-                        "message": "required property missing",
-                        "node_pos": _find_node_pos(mapping, path or "/"),
-                    }
-                )
-        props = schema.get("properties", {})
-        for key, subschema in props.items():
-            if key in ir:
-                # no fine-grained mapping available in prototype; pass same mapping
-                diags.extend(validate(ir[key], subschema, mapping, f"{path}/{key}"))
-        return diags
-
-    if t == "array":
-        if not isinstance(ir, list):
-            diags.append(
-                {
-                    "path": path or "/",
-                    "message": f"expected array, got {type(ir).__name__}",
-                    "node_pos": _find_node_pos(mapping, path or "/"),
-                }
-            )
-            return diags
-        item_schema = schema.get("items")
-        if item_schema:
-            for idx, item in enumerate(ir):
-                diags.extend(validate(item, item_schema, mapping, f"{path}/{idx}"))
-        return diags
-
-    if t == "string":
-        if not isinstance(ir, str):
-            diags.append(
-                {
-                    "path": path or "/",
-                    "message": f"expected string, got {type(ir).__name__}",
-                    "node_pos": _find_node_pos(mapping, path or "/"),
-                }
-            )
-        return diags
+    while work:
+        ir, schema, path = work.pop()
+        t = schema.get("type")
+        expected = _TYPE_CHECKS.get(t) if isinstance(t, str) else None
+        if expected is None:
+            # no (supported) type specified — accept anything
+            continue
 
-    if t == "number":
-        if not isinstance(ir, (int, float)):
+        node_path = path or "/"
+        if not isinstance(ir, expected):
             diags.append(
                 {
-                    "path": path or "/",
-                    "message": f"expected number, got {type(ir).__name__}",
-                    "node_pos": _find_node_pos(mapping, path or "/"),
+                    "path": node_path,
+                    "message": _TYPE_MISMATCH_MSG.format(t, type(ir).__name__),
+                    "node_pos": None if index is None else find_pos(index, node_path),
                 }
             )
-        return diags
+            continue
 
-    if t == "boolean":
-        if not isinstance(ir, bool):
-            diags.append(
-                {
-                    "path": path or "/",
-                    "message": f"expected boolean, got {type(ir).__name__}",
-                    "node_pos": _find_node_pos(mapping, path or "/"),
-                }
-            )
-        return diags
+        if t == "object":
+            # required
+            for req in schema.get("required", ()):
+                if req not in ir:
+                    diags.append(
+                        {
+                            "path": f"{path}/{req}",
+                            "message": _REQUIRED_MISSING_MSG,
+                            "node_pos": None if index is None else find_pos(index, node_path),
+                        }
+                    )
+            # no fine-grained mapping available in prototype; pass same mapping.
+            # Push in reverse so properties are visited in declaration order.
+            children = [
+                (ir[key], subschema, f"{path}/{key}")
+                for key, subschema in schema.get("properties", {}).items()
+                if key in ir
+            ]
+            children.reverse()
+            work.extend(children)
+        elif t == "array":
+            item_schema = schema.get("items")
+            if item_schema:
+                for idx in range(len(ir) - 1, -1, -1):
+                    work.append((ir[idx], item_schema, f"{path}/{idx}"))
 
-    # no type specified — accept anything
     return diags
 
 
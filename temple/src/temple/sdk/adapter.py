@@ -10,9 +10,12 @@ from typing import Any
 from temple.diagnostics import SourceRange
 
 _FILTER_NAME_RE = re.compile(r"\|\s*([A-Za-z_]\w*)")
+# Joins expressions for a single filter scan; neither \s nor \w matches it, so
+# no match can straddle two expressions.
+_EXPR_SEPARATOR = "\x01"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdapterDiagnostic:
     """Engine diagnostic normalized to Temple's diagnostic model."""
 
@@ -23,40 +26,41 @@ class AdapterDiagnostic:
     related: tuple[str, ...] = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IRText:
     value: str
     source_range: SourceRange
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IRExpression:
     expr: str
     source_range: SourceRange
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IRStatement:
     kind: str
-    args: dict[str, Any]
+    # dicts are unhashable: keep args in __eq__ but out of the generated __hash__
+    args: dict[str, Any] = field(hash=False)
     source_range: SourceRange
 
 
 IRNode = IRText | IRExpression | IRStatement
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IRBlock:
     nodes: tuple[IRNode, ...]
     source_range: SourceRange
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdapterParseResult:
     """Result object returned by adapter parse calls."""
 
     ir: IRBlock
-    source_map: dict[Any, SourceRange] = field(default_factory=dict)
+    source_map: dict[Any, SourceRange] = field(default_factory=dict, hash=False)
     diagnostics: tuple[AdapterDiagnostic, ...] = ()
     warnings: tuple[str, ...] = ()
 
@@ -76,42 +80,54 @@ class AdapterBase(ABC):
         return source_map.get(engine_location)
 
     def list_used_filters(self, ir: IRBlock) -> list[str]:
-        seen: set[str] = set()
-        ordered: list[str] = []
-        for node in collect_ir_nodes(ir):
-            if isinstance(node, IRExpression):
-                for filter_name in _FILTER_NAME_RE.findall(node.expr):
-                    if filter_name not in seen:
-                        seen.add(filter_name)
-                        ordered.append(filter_name)
-        return ordered
+        # Distinct expressions in first-use order, scanned as one buffer.
+        exprs = dict.fromkeys(
+            node.expr for node in collect_ir_nodes(ir) if isinstance(node, IRExpression)
+        )
+        joined = _EXPR_SEPARATOR.join(exprs)
+        names = dict.fromkeys(match.group(1) for match in _FILTER_NAME_RE.finditer(joined))
+        return list(names)
 
 
 def collect_ir_nodes(block: IRBlock) -> tuple[IRNode, ...]:
     """Walk IR depth-first and return all nodes in visit order."""
     out: list[IRNode] = []
+    append = out.append
+    # Explicit LIFO stack; children are pushed reversed to keep visit order.
+    stack: list[Any] = [block]
+    pop = stack.pop
+    push_all = stack.extend
+
+    while stack:
+        value = pop()
+        # Exact-type checks first (a pointer compare each); the isinstance
+        # chain below only runs for subclasses and unknown values.
+        cls = value.__class__
+        if cls is IRText or cls is IRExpression:
+            append(value)
+        elif cls is IRBlock:
+            push_all(reversed(value.nodes))
+        elif cls is IRStatement:
+            append(value)
+            push_all(reversed(value.args.values()))
+        elif cls is str:
+            continue
+        elif cls is dict:
+            push_all(reversed(value.values()))
+        elif cls is list or cls is tuple:
+            push_all(reversed(value))
+        elif isinstance(value, IRBlock):
+            push_all(reversed(value.nodes))
+        elif isinstance(value, (IRText, IRExpression)):
+            append(value)
+        elif isinstance(value, IRStatement):
+            append(value)
+            push_all(reversed(value.args.values()))
+        elif isinstance(value, dict):
+            push_all(reversed(value.values()))
+        elif isinstance(value, (list, tuple)):
+            push_all(reversed(value))
 
-    def _walk_value(value: Any) -> None:
-        if isinstance(value, IRBlock):
-            for child in value.nodes:
-                _walk_value(child)
-            return
-        if isinstance(value, (IRText, IRExpression, IRStatement)):
-            out.append(value)
-            if isinstance(value, IRStatement):
-                for arg_value in value.args.values():
-                    _walk_value(arg_value)
-            return
-        if isinstance(value, dict):
-            for nested in value.values():
-                _walk_value(nested)
-            return
-        if isinstance(value, (list, tuple)):
-            for nested in value:
-                _walk_value(nested)
-            return
-
-    _walk_value(block)
     return tuple(out)
 
 
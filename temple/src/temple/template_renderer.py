@@ -8,6 +8,8 @@ Provides:
 - Placeholder handling for expressions/comments
 """
 
+from functools import lru_cache
+
 from temple.template_tokenizer import Token, temple_tokenizer
 from temple.whitespace_control import apply_left_trim, trim_leading_whitespace
 
@@ -38,24 +40,32 @@ class BlockValidator:
             List of error messages (empty if valid)
         """
         errors = []
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        opens = self.BLOCK_OPENS
 
         for token in tokens:
             if token.type != "statement":
                 continue
 
-            # Token value (trimmed) and first keyword
+            # Token value (trimmed) and first keyword; split at most once so the
+            # statement arguments are never broken into words.
             raw_value = token.value.strip() if token.value else ""
-            keyword = raw_value.split()[0].lower() if raw_value else ""
+            if not raw_value:
+                continue
+            parts = raw_value.split(None, 1)
+            keyword = parts[0].lower()
 
             # Opening block
-            if keyword in self.BLOCK_OPENS:
-                self.stack.append((keyword, token.start[0], token.start[1]))
+            if keyword in opens:
+                push((keyword, token.start[0], token.start[1]))
 
             # Closing block: only the generic 'end' token (exact match)
             # is treated as a closer. Variants like 'end if' are not
             # considered canonical closers.
-            elif raw_value.lower() == "end":
-                if not self.stack:
+            elif keyword == "end" and len(parts) == 1:
+                if not stack:
                     errors.append(
                         f"Unexpected closing block '{keyword}' at "
                         f"line {token.start[0] + 1}, col {token.start[1] + 1}"
@@ -63,12 +73,12 @@ class BlockValidator:
                     continue
 
                 # Proper close: pop the matching opener
-                self.stack.pop()
+                pop()
 
             # Note: only the exact 'end' token is treated as a closer.
 
         # Check for unclosed blocks
-        for block_type, line, col in self.stack:
+        for block_type, line, col in stack:
             errors.append(
                 f"Unclosed block '{block_type}' at line {line + 1}, col {col + 1}"
             )
@@ -97,19 +107,41 @@ def render_passthrough(
     Returns:
         Tuple of (rendered_output, error_messages)
     """
-    tokens = list(temple_tokenizer(text, delimiters))
-    errors = []
+    delim_key = (
+        tuple((ttype, tuple(pair)) for ttype, pair in delimiters.items())
+        if delimiters
+        else None
+    )
+    output, errors = _render_passthrough_cached(text, delim_key, validate_blocks)
+    return output, list(errors)
 
-    # Validate block nesting
-    if validate_blocks:
-        validator = BlockValidator()
-        errors = validator.validate(tokens)
+
+@lru_cache(maxsize=256)
+def _render_passthrough_cached(
+    text: str,
+    delim_key: tuple[tuple[str, tuple[str, str]], ...] | None,
+    validate_blocks: bool,
+) -> tuple[str, tuple[str, ...]]:
+    """Render passthrough output; a pure function of its (hashable) arguments.
+
+    ``delim_key`` keeps the delimiter order, since token types are matched in
+    that order. Results are immutable so cached values cannot be mutated.
+    """
+    delimiters = dict(delim_key) if delim_key is not None else None
+    # Single streaming pass over the tokenizer: concatenate text tokens while
+    # keeping only statement tokens aside for block validation, instead of
+    # materializing every token and walking the list twice.
+    statements: list[Token] = []
+    keep_statement = statements.append if validate_blocks else None
 
     # Concatenate text tokens only (passthrough), honoring trim markers.
-    output_parts = []
+    output_parts: list[str] = []
     trim_next_text_left = False
-    for token in tokens:
-        if token.type in {"statement", "expression", "comment"}:
+    for token in temple_tokenizer(text, delimiters):
+        token_type = token.type
+        if token_type in {"statement", "expression", "comment"}:
+            if token_type == "statement" and keep_statement is not None:
+                keep_statement(token)
             # Trim-right should apply only to immediately following text; if we
             # encounter another template token first, clear stale intent.
             if trim_next_text_left:
@@ -120,15 +152,23 @@ def render_passthrough(
                 trim_next_text_left = True
             continue
 
-        if token.type == "text":
+        if token_type == "text":
             text_value = token.value
             if trim_next_text_left:
                 text_value = trim_leading_whitespace(text_value)
                 trim_next_text_left = False
             output_parts.append(text_value)
 
+    # Validate block nesting
+    errors = BlockValidator().validate(statements) if validate_blocks else []
+
     output = "".join(output_parts)
-    return output, errors
+    return output, tuple(errors)
+
+
+def clear_render_cache() -> None:
+    """Drop all cached passthrough renders (mainly for tests)."""
+    _render_passthrough_cached.cache_clear()
 
 
 def render(
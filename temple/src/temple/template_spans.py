@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 
 from temple.defaults import DEFAULT_TEMPLATE_DELIMITERS
 from temple.template_tokenizer import Token, temple_tokenizer
 from temple.whitespace_control import TRIM_MARKERS
 
+# Characters that do not count as line content in text tokens
+_LINE_WHITESPACE = " \t\r\n"
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TemplateTokenSpan:
     """Token plus absolute offsets for token and inner content."""
 
@@ -20,7 +25,7 @@ class TemplateTokenSpan:
     content_end_offset: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TemplateLineMetadata:
     """Per-line classification for template-aware base-cleaning logic."""
 
@@ -36,12 +41,47 @@ class TemplateLineMetadata:
         return self.has_template_token and not self.has_non_whitespace_text
 
 
-def _line_start_offsets(text: str) -> list[int]:
-    starts = [0]
-    for index, char in enumerate(text):
-        if char == "\n":
-            starts.append(index + 1)
-    return starts
+@dataclass(frozen=True, slots=True)
+class TemplateTokenSpanIndex:
+    """Token spans grouped by type, ordered by content start for bisect lookups."""
+
+    content_starts: dict[str, tuple[int, ...]]
+    spans: dict[str, tuple[TemplateTokenSpan, ...]]
+
+    @classmethod
+    def from_spans(
+        cls,
+        spans: list[TemplateTokenSpan] | tuple[TemplateTokenSpan, ...],
+    ) -> TemplateTokenSpanIndex:
+        grouped: dict[str, list[TemplateTokenSpan]] = {}
+        for span in spans:
+            grouped.setdefault(span.token.type, []).append(span)
+        ordered = {
+            token_type: tuple(sorted(group, key=lambda span: span.content_start_offset))
+            for token_type, group in grouped.items()
+        }
+        return cls(
+            content_starts={
+                token_type: tuple(span.content_start_offset for span in group)
+                for token_type, group in ordered.items()
+            },
+            spans=ordered,
+        )
+
+    def find(self, offset: int, token_type: str) -> TemplateTokenSpan | None:
+        """Return the span of ``token_type`` whose content range holds ``offset``."""
+        starts = self.content_starts.get(token_type)
+        if not starts:
+            return None
+        # Spans of one type do not overlap, so only the last span starting
+        # at or before the offset can contain it.
+        index = bisect_right(starts, offset) - 1
+        if index < 0:
+            return None
+        span = self.spans[token_type][index]
+        if offset <= span.content_end_offset:
+            return span
+        return None
 
 
 def _offset_for_position(line_starts: list[int], line: int, column: int, text_len: int) -> int:
@@ -52,29 +92,29 @@ def _offset_for_position(line_starts: list[int], line: int, column: int, text_le
     return min(line_starts[line] + max(column, 0), text_len)
 
 
-def _line_ranges(text: str) -> list[tuple[int, int, str]]:
+def _scan_lines(text: str) -> tuple[list[int], list[tuple[int, int, str]]]:
+    """Return ``\\n``-based line start offsets and ``splitlines`` line ranges.
+
+    Both come from a single ``splitlines`` pass: every ``\\n`` ends a
+    splitlines line (alone or as ``\\r\\n``), so a line start is recorded
+    after each line that ends in ``\\n``.
+    """
+    line_starts = [0]
     ranges: list[tuple[int, int, str]] = []
     cursor = 0
     for line in text.splitlines(keepends=True):
+        line_len = len(line)
         line_ending = ""
-        core = line
-        if core.endswith("\r\n"):
-            core = core[:-2]
-            line_ending = "\r\n"
-        elif core.endswith("\n"):
-            core = core[:-1]
-            line_ending = "\n"
-        elif core.endswith("\r"):
-            core = core[:-1]
+        if line.endswith("\n"):
+            line_ending = "\r\n" if line.endswith("\r\n") else "\n"
+        elif line.endswith("\r"):
             line_ending = "\r"
-        start = cursor
-        end = start + len(core)
-        ranges.append((start, end, line_ending))
-        cursor += len(line)
+        ranges.append((cursor, cursor + line_len - len(line_ending), line_ending))
+        cursor += line_len
+        if line_ending.endswith("\n"):
+            line_starts.append(cursor)
 
-    if not ranges and text == "":
-        return []
-    return ranges
+    return line_starts, ranges
 
 
 def _content_offsets_for_token(token: Token, start_offset: int, end_offset: int) -> tuple[int, int]:
@@ -99,25 +139,88 @@ def _token_end_line_for_marking(token: Token) -> int:
     return end_line
 
 
+def _delimiters_key(
+    delimiters: dict[str, tuple[str, str]] | None,
+) -> tuple[tuple[str, tuple[str, str]], ...] | None:
+    if not delimiters:
+        return None
+    return tuple((ttype, (pair[0], pair[1])) for ttype, pair in delimiters.items())
+
+
+def build_token_spans(
+    text: str,
+    delimiters: dict[str, tuple[str, str]] | None = None,
+) -> list[TemplateTokenSpan]:
+    """Return token spans for template text, without line classification.
+
+    Use this when only token locations are needed (e.g. cursor lookups);
+    it skips the per-line scan done by ``build_template_metadata``.
+    """
+    return list(_build_token_spans_cached(text, _delimiters_key(delimiters)))
+
+
+def build_token_span_index(
+    text: str,
+    delimiters: dict[str, tuple[str, str]] | None = None,
+) -> TemplateTokenSpanIndex:
+    """Return a cached per-type index of token spans for offset lookups."""
+    return _build_token_span_index_cached(text, _delimiters_key(delimiters))
+
+
+def build_line_metadata(
+    text: str,
+    token_spans: list[TemplateTokenSpan] | tuple[TemplateTokenSpan, ...],
+) -> list[TemplateLineMetadata]:
+    """Return line classifications for template text and its token spans."""
+    return list(_build_line_metadata(text, token_spans))
+
+
 def build_template_metadata(
     text: str,
     delimiters: dict[str, tuple[str, str]] | None = None,
 ) -> tuple[list[TemplateTokenSpan], list[TemplateLineMetadata]]:
-    """Return token spans and line classifications for template text."""
+    """Return token spans and line classifications for template text.
+
+    Results are cached per (text, delimiters); editors re-query the same
+    document contents many times between edits.
+    """
+    token_spans, lines = _build_template_metadata_cached(
+        text, _delimiters_key(delimiters)
+    )
+    return list(token_spans), list(lines)
+
+
+@lru_cache(maxsize=64)
+def _build_token_spans_cached(
+    text: str,
+    delim_key: tuple[tuple[str, tuple[str, str]], ...] | None,
+) -> tuple[TemplateTokenSpan, ...]:
+    """Build token spans; a pure function of its (hashable) arguments.
+
+    ``delim_key`` keeps the delimiter order, since token types are matched in
+    that order. Results are immutable so cached values cannot be mutated.
+    """
+    delimiters = dict(delim_key) if delim_key is not None else None
     effective_delimiters = delimiters or DEFAULT_TEMPLATE_DELIMITERS
-    tokens = list(temple_tokenizer(text, effective_delimiters))
-    line_starts = _line_start_offsets(text)
-    line_ranges = _line_ranges(text)
     text_len = len(text)
+    # Only needed for tokens without tokenizer-provided offsets
+    line_starts: list[int] | None = None
 
     token_spans: list[TemplateTokenSpan] = []
-    for token in tokens:
-        start_offset = _offset_for_position(
-            line_starts, token.start[0], token.start[1], text_len
-        )
-        end_offset = _offset_for_position(
-            line_starts, token.end[0], token.end[1], text_len
-        )
+    for token in temple_tokenizer(text, effective_delimiters):
+        if token.start_offset is not None and token.end_offset is not None:
+            # Tokenizer-provided absolute offsets: no line/column round trip
+            start_offset = token.start_offset
+            end_offset = token.end_offset
+        else:
+            if line_starts is None:
+                line_starts, _ = _scan_lines(text)
+            start_offset = _offset_for_position(
+                line_starts, token.start[0], token.start[1], text_len
+            )
+            end_offset = _offset_for_position(
+                line_starts, token.end[0], token.end[1], text_len
+            )
         content_start, content_end = _content_offsets_for_token(
             token, start_offset, end_offset
         )
@@ -131,25 +234,60 @@ def build_template_metadata(
             )
         )
 
-    has_template_token = [False] * len(line_ranges)
-    has_non_whitespace_text = [False] * len(line_ranges)
+    return tuple(token_spans)
+
+
+@lru_cache(maxsize=64)
+def _build_token_span_index_cached(
+    text: str,
+    delim_key: tuple[tuple[str, tuple[str, str]], ...] | None,
+) -> TemplateTokenSpanIndex:
+    return TemplateTokenSpanIndex.from_spans(_build_token_spans_cached(text, delim_key))
+
+
+@lru_cache(maxsize=64)
+def _build_template_metadata_cached(
+    text: str,
+    delim_key: tuple[tuple[str, tuple[str, str]], ...] | None,
+) -> tuple[tuple[TemplateTokenSpan, ...], tuple[TemplateLineMetadata, ...]]:
+    """Build spans and line metadata; cached like ``_build_token_spans_cached``."""
+    token_spans = _build_token_spans_cached(text, delim_key)
+    return token_spans, _build_line_metadata(text, token_spans)
+
+
+def _build_line_metadata(
+    text: str,
+    token_spans: list[TemplateTokenSpan] | tuple[TemplateTokenSpan, ...],
+) -> tuple[TemplateLineMetadata, ...]:
+    _, line_ranges = _scan_lines(text)
+    line_count = len(line_ranges)
+    has_template_token = [False] * line_count
+    has_non_whitespace_text = [False] * line_count
 
     for span in token_spans:
         token = span.token
         if token.type == "text":
+            raw = token.raw_token
+            if not raw.strip(_LINE_WHITESPACE):
+                continue
             line = token.start[0]
-            for char in token.raw_token:
-                if (
-                    line < len(has_non_whitespace_text)
-                    and char not in {" ", "\t", "\r", "\n"}
-                ):
+            if "\n" not in raw:
+                # Single-line text with content: the strip above decided it
+                if line < line_count:
+                    has_non_whitespace_text[line] = True
+                continue
+            # Split at newlines (C-level) and test each line's piece for any
+            # non-whitespace character instead of classifying every char.
+            for piece in raw.split("\n"):
+                if line >= line_count:
+                    break
+                if piece.strip(_LINE_WHITESPACE):
                     has_non_whitespace_text[line] = True
-                if char == "\n":
-                    line += 1
+                line += 1
             continue
 
         start_line = max(token.start[0], 0)
-        end_line = min(_token_end_line_for_marking(token), len(line_ranges) - 1)
+        end_line = min(_token_end_line_for_marking(token), line_count - 1)
         for line_index in range(start_line, end_line + 1):
             has_template_token[line_index] = True
 
@@ -166,15 +304,29 @@ def build_template_metadata(
             )
         )
 
-    return token_spans, lines
+    return tuple(lines)
+
+
+def clear_template_metadata_cache() -> None:
+    """Drop all cached template metadata (e.g. after a document is saved)."""
+    _build_template_metadata_cached.cache_clear()
+    _build_token_spans_cached.cache_clear()
+    _build_token_span_index_cached.cache_clear()
+    _delimiter_offsets.cache_clear()
 
 
 def find_token_span_at_offset(
-    spans: list[TemplateTokenSpan],
+    spans: list[TemplateTokenSpan] | TemplateTokenSpanIndex,
     offset: int,
     token_type: str,
 ) -> TemplateTokenSpan | None:
-    """Find token span by token type where the offset is inside token content."""
+    """Find token span by token type where the offset is inside token content.
+
+    A ``TemplateTokenSpanIndex`` (see ``build_token_span_index``) is searched
+    by bisection; a plain span list is scanned in order.
+    """
+    if isinstance(spans, TemplateTokenSpanIndex):
+        return spans.find(offset, token_type)
     for span in spans:
         if span.token.type != token_type:
             continue
@@ -183,12 +335,42 @@ def find_token_span_at_offset(
     return None
 
 
+@lru_cache(maxsize=128)
+def _delimiter_offsets(text: str, token: str) -> tuple[int, ...]:
+    """Return start offsets of every (possibly overlapping) ``token`` in ``text``."""
+    offsets: list[int] = []
+    index = text.find(token)
+    while index >= 0:
+        offsets.append(index)
+        index = text.find(token, index + 1)
+    return tuple(offsets)
+
+
+def _rfind_offset(text: str, token: str, end: int) -> int:
+    """Equivalent to ``text.rfind(token, 0, end)`` using the cached offsets."""
+    offsets = _delimiter_offsets(text, token)
+    end = slice(0, end).indices(len(text))[1]
+    index = bisect_right(offsets, end - len(token)) - 1
+    return offsets[index] if index >= 0 else -1
+
+
+def _find_offset(text: str, token: str, start: int) -> int:
+    """Equivalent to ``text.find(token, start)`` for ``start >= 0``."""
+    offsets = _delimiter_offsets(text, token)
+    index = bisect_left(offsets, start)
+    return offsets[index] if index < len(offsets) else -1
+
+
 def build_unclosed_span(
     text: str,
     offset: int,
     token_type: str,
 ) -> tuple[int, int, int, int] | None:
-    """Return raw span tuple for an active unclosed expression/statement region."""
+    """Return raw span tuple for an active unclosed expression/statement region.
+
+    Delimiter positions are indexed once per text, so repeated cursor queries
+    on the same document bisect instead of rescanning it.
+    """
     if token_type == "expression":
         open_token = "{{"
         close_token = "}}"
@@ -198,11 +380,11 @@ def build_unclosed_span(
     else:
         return None
 
-    open_start = text.rfind(open_token, 0, offset + 1)
+    open_start = _rfind_offset(text, open_token, offset + 1)
     if open_start < 0:
         return None
 
-    last_close_before = text.rfind(close_token, 0, offset + 1)
+    last_close_before = _rfind_offset(text, close_token, offset + 1)
     if last_close_before > open_start:
         return None
 
@@ -210,7 +392,7 @@ def build_unclosed_span(
     if content_start < len(text) and text[content_start] in TRIM_MARKERS:
         content_start += 1
 
-    close_start = text.find(close_token, content_start)
+    close_start = _find_offset(text, close_token, content_start)
     if close_start >= 0:
         content_end = close_start
         if content_end > content_start and text[content_end - 1] in TRIM_MARKERS:
@@ -7,14 +7,17 @@ Supports configurable delimiters and efficient regex pattern caching.
 """
 
 import re
+import sys
 from collections.abc import Iterator
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, cast
 
 from temple.defaults import DEFAULT_TEMPLATE_DELIMITERS
 from temple.whitespace_control import parse_token_trim_markers
 
 TokenType = Literal["text", "statement", "expression", "comment"]
+# Delimiter maps, keyed by token type (plain str keys, as in the defaults, work too)
+_DelimiterMap = dict[TokenType, tuple[str, str]] | dict[str, tuple[str, str]]
 
 
 @lru_cache(maxsize=128)
@@ -38,20 +41,57 @@ def _compile_token_pattern(delimiters_tuple: tuple) -> re.Pattern:
     # Build regex pattern with capture groups for each token type
     pattern_parts = []
     for ttype, (start, end) in delims.items():
-        pattern_parts.append(f"(?P<{ttype}>{re.escape(start)}.*?{re.escape(end)})")
+        pattern_parts.append(f"(?P<{ttype}>{re.escape(start)}{_token_body(end)})")
     combined_pattern = "|".join(pattern_parts)
     return re.compile(combined_pattern, re.DOTALL)
 
 
+def _token_body(end: str) -> str:
+    """Return a regex matching token content up to the first ``end`` delimiter.
+
+    Equivalent to ``.*?end`` but written as an unrolled loop
+    (``[^e]*(?:e(?!rest)[^e]*)*end``) so the engine scans runs of
+    non-delimiter characters in one step instead of retrying the close
+    delimiter after every character.
+    """
+    if not end:
+        return ""
+    first = re.escape(end[0])
+    first_class = f"[^{re.escape(end[0])}]*"
+    if len(end) == 1:
+        return f"{first_class}{first}"
+    rest = re.escape(end[1:])
+    return f"{first_class}(?:{first}(?!{rest}){first_class})*{re.escape(end)}"
+
+
 class Token:
+    __slots__ = (
+        "raw_token",
+        "start",
+        "start_offset",
+        "end_offset",
+        "delimiters",
+        "type",
+        "value",
+        "delimiter_start",
+        "delimiter_end",
+        "trim_left",
+        "trim_right",
+        "end",
+    )
+
     def __init__(
         self,
         raw_token: str,
         start: tuple[int, int],
         delimiters: dict[TokenType, tuple[str, str]] | None = None,
+        start_offset: int | None = None,
     ):
         self.raw_token = raw_token
         self.start = start
+        # Absolute offsets into the source text, when known (set by the tokenizer)
+        self.start_offset = start_offset
+        self.end_offset = start_offset + len(raw_token) if start_offset is not None else None
         self.delimiters = delimiters or DEFAULT_TEMPLATE_DELIMITERS
         (
             self.type,
@@ -65,6 +105,36 @@ class Token:
         )
         self.end = self._compute_end()
 
+    @classmethod
+    def _from_known(
+        cls,
+        raw_token: str,
+        start: tuple[int, int],
+        delimiters: _DelimiterMap,
+        start_offset: int,
+        token_type: TokenType,
+        value: str,
+        delimiter_start: str | None = None,
+        delimiter_end: str | None = None,
+        trim_left: bool = False,
+        trim_right: bool = False,
+    ) -> "Token":
+        """Build a token whose type and parts are already known (tokenizer fast path)."""
+        token = cls.__new__(cls)
+        token.raw_token = raw_token
+        token.start = start
+        token.start_offset = start_offset
+        token.end_offset = start_offset + len(raw_token)
+        token.delimiters = delimiters
+        token.type = token_type
+        token.value = value
+        token.delimiter_start = delimiter_start
+        token.delimiter_end = delimiter_end
+        token.trim_left = trim_left
+        token.trim_right = trim_right
+        token.end = _advance(start, raw_token)
+        return token
+
     def _parse_type_and_value(self):
         for ttype, (start_delim, end_delim) in self.delimiters.items():
             if self.raw_token.startswith(start_delim) and self.raw_token.endswith(
@@ -80,14 +150,7 @@ class Token:
         return "text", self.raw_token, None, None, False, False
 
     def _compute_end(self):
-        line, col = self.start
-        for c in self.raw_token:
-            if c == "\n":
-                line += 1
-                col = 0
-            else:
-                col += 1
-        return (line, col)
+        return _advance(self.start, self.raw_token)
 
     def __repr__(self):
         return (
@@ -101,7 +164,7 @@ class Token:
 
 def temple_tokenizer(
     text: str,
-    delimiters: dict[TokenType, tuple[str, str]] | None = None,
+    delimiters: _DelimiterMap | None = None,
 ) -> Iterator[Token]:
     """
     Yields Token objects for text, statement, expression, and comment regions.
@@ -127,39 +190,56 @@ def temple_tokenizer(
 
     # Get cached compiled pattern
     token_pattern = _compile_token_pattern(delims_tuple)
+    # Match group names are fresh strings; map them to interned type names so
+    # later ``token.type == "..."`` checks succeed on identity.
+    token_types: dict[str | None, TokenType] = {
+        ttype: cast(TokenType, sys.intern(ttype)) for ttype in delims
+    }
     pos = 0
-    line = 0
-    col = 0
-    while pos < len(text):
-        m = token_pattern.search(text, pos)
-        if not m:
-            # Remaining text is plain text
-            value = text[pos:]
-            if value:
-                yield Token(value, (line, col), delimiters)
-            break
+    from_known = Token._from_known
+    position = (0, 0)
+    for m in token_pattern.finditer(text):
+        match_start = m.start()
         # Text before token
-        if m.start() > pos:
-            value = text[pos : m.start()]
-            yield Token(value, (line, col), delimiters)
-            line, col = _advance((line, col), value)
-        # Token itself
-        for ttype in delims:
-            if m.group(ttype):
-                raw_token = m.group(ttype)
-                yield Token(raw_token, (line, col), delimiters)
-                line, col = _advance((line, col), raw_token)
-                break
+        if match_start > pos:
+            value = text[pos:match_start]
+            token = from_known(value, position, delims, pos, "text", value)
+            yield token
+            position = token.end
+        # Token itself; the matching named group gives its type directly
+        raw_token = m.group()
+        if raw_token:
+            token_type = token_types[m.lastgroup]
+            start_delim, end_delim = delims[token_type]
+            content_start, content_end, trim_left, trim_right = parse_token_trim_markers(
+                raw_token, start_delim, end_delim
+            )
+            token = from_known(
+                raw_token,
+                position,
+                delims,
+                match_start,
+                token_type,
+                raw_token[content_start:content_end].strip(),
+                start_delim,
+                end_delim,
+                trim_left,
+                trim_right,
+            )
+            yield token
+            position = token.end
         pos = m.end()
+    # Remaining text is plain text
+    if pos < len(text):
+        value = text[pos:]
+        yield from_known(value, position, delims, pos, "text", value)
 
 
 def _advance(start: tuple[int, int], value: str) -> tuple[int, int]:
     """Advance (line, col) by value."""
     line, col = start
-    for c in value:
-        if c == "\n":
-            line += 1
-            col = 0
-        else:
-            col += 1
-    return (line, col)
+    newlines = value.count("\n")
+    if not newlines:
+        return (line, col + len(value))
+    # Column restarts after the last newline
+    return (line + newlines, len(value) - value.rfind("\n") - 1)
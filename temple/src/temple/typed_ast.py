@@ -1,14 +1,67 @@
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from typing import Any, Optional
 
 from temple.diagnostics import Position, SourceRange
-from temple.expression_eval import evaluate_expression
+from temple.expression_eval import constant_value, expression_resolver
 
 
 class TemplateError(Exception):
     pass
 
 
+_MISSING = object()
+
+
+class _Scope(dict):
+    """Loop scope: a small dict of loop bindings that falls back to its parent.
+
+    Lookups of the loop variable and ``loop`` stay in C-level dict code, and
+    the parent context is never copied. Writes (e.g. Set) land in the scope.
+    """
+
+    __slots__ = ("_parent",)
+
+    def __init__(self, parent: Any):
+        super().__init__()
+        self._parent = parent
+
+    def __missing__(self, key: str) -> Any:
+        return self._parent[key]
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._parent
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = dict.get(self, key, _MISSING)
+        return self._parent.get(key, default) if value is _MISSING else value
+
+
+# Mapping-less render function for a Block: render(context, includes, out)
+_RenderFn = Callable[[dict[str, Any], Any, list[Any]], None]
+
+
+@lru_cache(maxsize=256)
+def _child_segments(count: int) -> tuple[str, ...]:
+    """Return the mapping path suffixes ``/0`` .. ``/count-1`` for child nodes."""
+    return tuple(f"/{idx}" for idx in range(count))
+
+
+def _emit(out: list[Any], value: Any) -> None:
+    """Append a leaf value to an output buffer, flattening lists and dropping None."""
+    # Exact str (the common case) is settled by one identity check; list data
+    # may be a subclass, so flattening keeps the isinstance test.
+    if value.__class__ is str:
+        out.append(value)
+    elif isinstance(value, list):
+        out.extend(value)
+    elif value is not None:
+        out.append(value)
+
+
 class Node:
+    __slots__ = ("_source_range", "start")
+
     def __init__(self, source_range: SourceRange):
         # `source_range` is the canonical SourceRange for this node.
         self._source_range = source_range
@@ -20,17 +73,27 @@ class Node:
     def source_range(self) -> SourceRange:
         return self._source_range
 
+    def _bind(self) -> None:
+        """Rebuild caches derived from this node's attributes (see Block.invalidate)."""
+
     def evaluate(
         self,
         context: dict[str, Any],
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> Any:
+        # ``path`` only labels ``mapping`` entries; nodes pass "" to children
+        # instead of building child paths when no mapping is collected.
+        # When ``_out`` is given, nodes append their output to it (flattened,
+        # without None) so parents need not re-flatten returned lists.
         raise NotImplementedError()
 
 
 class Text(Node):
+    __slots__ = ("text",)
+
     def __init__(self, source_range: SourceRange, text: str):
         super().__init__(source_range)
         self.text = text
@@ -41,18 +104,35 @@ class Text(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> str:
+        if _out is not None:
+            _out.append(self.text)
         return self.text
 
 
 class Expression(Node):
+    __slots__ = ("_expr", "_resolve_fn")
+
     def __init__(self, source_range: SourceRange, expr: str | None = None):
-        expr_val = expr
         super().__init__(source_range)
-        self.expr = expr_val
+        self.expr = expr
+
+    @property
+    def expr(self) -> str | None:
+        return self._expr
+
+    @expr.setter
+    def expr(self, expr: str | None) -> None:
+        self._expr = expr
+        self._bind()
+
+    def _bind(self) -> None:
+        # Parse once; evaluation reuses the pipeline, path parts and AST
+        self._resolve_fn = expression_resolver(self._expr)
 
     def _resolve(self, context: dict[str, Any]) -> Any:
-        return evaluate_expression(self.expr, context)
+        return self._resolve_fn(context)
 
     def evaluate(
         self,
@@ -60,14 +140,26 @@ class Expression(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> Any:
-        val = self._resolve(context)
+        val = self._resolve_fn(context)
         if mapping is not None:
-            mapping.append((path or "/", self.source_range.start))
+            mapping.append((path or "/", self.start))
+        if _out is not None:
+            _emit(_out, val)
         return val
 
 
 class If(Node):
+    __slots__ = (
+        "_condition",
+        "body",
+        "_else_if_parts",
+        "else_body",
+        "_cond_expr",
+        "_else_if_exprs",
+    )
+
     def __init__(
         self,
         source_range: "SourceRange",
@@ -77,10 +169,37 @@ class If(Node):
         else_body: Optional["Block"] = None,
     ):
         super().__init__(source_range)
-        self.condition = condition
+        self._condition = condition
         self.body = body
-        self.else_if_parts = else_if_parts or []
+        self._else_if_parts = else_if_parts or []
         self.else_body = else_body
+        self._bind()
+
+    @property
+    def condition(self) -> str:
+        return self._condition
+
+    @condition.setter
+    def condition(self, condition: str) -> None:
+        self._condition = condition
+        self._bind()
+
+    @property
+    def else_if_parts(self) -> list[tuple[str, "Block"]]:
+        return self._else_if_parts
+
+    @else_if_parts.setter
+    def else_if_parts(self, else_if_parts: list[tuple[str, "Block"]]) -> None:
+        self._else_if_parts = else_if_parts
+        self._bind()
+
+    def _bind(self) -> None:
+        # Condition nodes are built once here rather than on every evaluate
+        self._cond_expr = Expression(self.source_range, self._condition)
+        self._else_if_exprs = [
+            Expression(self.source_range, else_if_cond)
+            for else_if_cond, _ in self._else_if_parts
+        ]
 
     def evaluate(
         self,
@@ -88,28 +207,50 @@ class If(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> Any:
-        cond_val = Expression(self.source_range, self.condition).evaluate(
-            context, includes, path + "/cond", mapping
+        track = mapping is not None
+        cond_val = self._cond_expr.evaluate(
+            context, includes, path + "/cond" if track else "", mapping
         )
         if cond_val:
-            return self.body.evaluate(context, includes, path + "/body", mapping)
+            return self.body.evaluate(
+                context, includes, path + "/body" if track else "", mapping, _out
+            )
         # Check else-if branches
-        for idx, (else_if_cond, else_if_body_blk) in enumerate(self.else_if_parts):
-            elif_val = Expression(self.source_range, else_if_cond).evaluate(
-                context, includes, path + f"/else_if[{idx}]/cond", mapping
+        for idx, (else_if_expr, (_, else_if_body_blk)) in enumerate(
+            zip(self._else_if_exprs, self.else_if_parts)
+        ):
+            elif_val = else_if_expr.evaluate(
+                context, includes, path + f"/else_if[{idx}]/cond" if track else "", mapping
             )
             if elif_val:
                 return else_if_body_blk.evaluate(
-                    context, includes, path + f"/else_if[{idx}]/body", mapping
+                    context,
+                    includes,
+                    path + f"/else_if[{idx}]/body" if track else "",
+                    mapping,
+                    _out,
                 )
         # Check else branch
         if self.else_body:
-            return self.else_body.evaluate(context, includes, path + "/else", mapping)
+            return self.else_body.evaluate(
+                context, includes, path + "/else" if track else "", mapping, _out
+            )
         return None
 
 
 class For(Node):
+    __slots__ = (
+        "var",
+        "_iterable",
+        "var_name",
+        "iterable_expr",
+        "body",
+        "body_block",
+        "_iter_expr",
+    )
+
     def __init__(
         self,
         source_range: "SourceRange",
@@ -132,50 +273,76 @@ class For(Node):
         self.body = body
         self.body_block = self.body
 
+    @property
+    def iterable(self) -> str:
+        return self._iterable
+
+    @iterable.setter
+    def iterable(self, iterable: str) -> None:
+        self._iterable = iterable
+        self._bind()
+
+    def _bind(self) -> None:
+        self._iter_expr = Expression(self.source_range, self._iterable)
+
     def evaluate(
         self,
         context: dict[str, Any],
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> list[Any]:
-        iterable = Expression(self.source_range, self.iterable).evaluate(
-            context, includes, path + "/iter", mapping
+        track = mapping is not None
+        iterable = self._iter_expr.evaluate(
+            context, includes, path + "/iter" if track else "", mapping
         )
         if iterable is None:
             return []
-        # try to get length for loop helpers
-        try:
-            length = len(iterable)
-        except Exception:
-            length = None
-        results = []
-        for idx, item in enumerate(iterable):
-            local_ctx = dict(context)
-            local_ctx[self.var] = item
+        # Sized iterables are used as-is; others (e.g. generators) are
+        # materialized once so loop.length and loop.last are always known.
+        items = iterable if hasattr(iterable, "__len__") else list(iterable)
+        length = len(items)
+        last_idx = length - 1
+        # Iteration bodies append straight into the caller's buffer when given
+        results = _out if _out is not None else []
+        body_evaluate = self.body.evaluate
+        var = self.var
+        # One scope layered over the caller's context for the whole loop; it
+        # is reset per iteration so writes (e.g. Set) never carry over
+        # to the next item or leak into the caller's context.
+        local_ctx = _Scope(context)
+        prefix = path + f"/for[{var}]" if track else ""
+        for idx, item in enumerate(items):
             # loop helper
             loop = {
                 "index": idx + 1,
                 "index0": idx,
                 "first": idx == 0,
-                "last": (idx == length - 1) if length is not None else False,
+                "last": idx == last_idx,
                 "length": length,
             }
+            local_ctx.clear()
+            local_ctx[var] = item
             local_ctx["loop"] = loop
-            val = self.body.evaluate(
-                local_ctx, includes, path + f"/for[{self.var}][{idx}]", mapping
+            body_evaluate(
+                local_ctx,
+                includes,
+                prefix + f"[{idx}]" if track else "",
+                mapping,
+                results,
             )
-            if isinstance(val, list):
-                results.extend(val)
-            else:
-                results.append(val)
         return results
 
 
 class Include(Node):
+    __slots__ = ("name", "_target")
+
     def __init__(self, source_range: "SourceRange", name: str):
         super().__init__(source_range)
         self.name = name
+        # Block bound by link(); None means look the name up at render time
+        self._target: Block | None = None
 
     def evaluate(
         self,
@@ -183,38 +350,70 @@ class Include(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> Any:
-        if not includes or self.name not in includes:
+        block = self._target
+        if block is None:
+            # One lookup per render; the map is not cached since callers may mutate it
+            block = includes.get(self.name) if includes else None
+        if block is None:
             raise TemplateError(f"Include not found: {self.name}")
-        return includes[self.name].evaluate(
-            context, includes, path + f"/include[{self.name}]", mapping
-        )
+        child_path = path + f"/include[{self.name}]" if mapping is not None else ""
+        return block.evaluate(context, includes, child_path, mapping, _out)
 
 
 class Set(Node):
+    __slots__ = ("name", "_expr", "_resolve_fn")
+
     def __init__(self, source_range: "SourceRange", name: str, expr: str):
         super().__init__(source_range)
         self.name = name
         self.expr = expr
 
+    @property
+    def expr(self) -> str:
+        return self._expr
+
+    @expr.setter
+    def expr(self, expr: str) -> None:
+        self._expr = expr
+        self._bind()
+
+    def _bind(self) -> None:
+        self._resolve_fn = expression_resolver(self._expr)
+
     def evaluate(
         self,
         context: dict[str, Any],
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> None:
         if self.name:
-            context[self.name] = evaluate_expression(self.expr, context)
+            context[self.name] = self._resolve_fn(context)
         if mapping is not None:
-            mapping.append((path or "/", self.source_range.start))
+            mapping.append((path or "/", self.start))
         return None
 
 
 class Block(Node):
+    """A sequence of child nodes, rendered in order.
+
+    Child evaluate callables are cached from ``nodes``; assigning ``nodes``
+    (or ``body``) rebinds them, and after editing the list in place call
+    ``invalidate()`` on the block that is rendered.
+
+    ``compile()`` opts a block into a generated render function. The nodes
+    below a compiled block are frozen: after changing any of them, call
+    ``invalidate()`` on it to compile again.
+    """
+
+    __slots__ = ("name", "_nodes", "_eval_fns", "_render_fn")
+
     def __init__(
         self,
-        nodes: list[Node] | None,
+        nodes: Sequence[Node] | None,
         name: str | None = None,
     ):
         sr = (
@@ -224,19 +423,79 @@ class Block(Node):
         )
         super().__init__(sr)
         self.name = name
-        # canonical storage
-        self.nodes = list(nodes) if nodes is not None else []
-        # Provide .body alias for older code expecting `.body`
-        self.body = self.nodes
+        self._nodes = list(nodes) if nodes is not None else []
+        self._bind()
+
+    @property
+    def nodes(self) -> list[Node]:
+        """Canonical child storage."""
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: list[Node]) -> None:
+        self._nodes = list(nodes)
+        self._bind()
+
+    # Provide .body alias for older code expecting `.body`
+    body = nodes
+
+    def _bind(self) -> None:
+        # Bound child evaluate methods, resolved once instead of per render.
+        # Plain Text children are stored as their string and appended inline.
+        self._eval_fns = tuple(
+            n.text if type(n) is Text else n.evaluate for n in self._nodes
+        )
+        # Generated render function, set by compile()
+        self._render_fn: _RenderFn | None = None
+
+    def compile(self) -> None:
+        """Render through one generated function instead of walking the tree.
+
+        Compiling costs more than a single tree walk, so this pays off for
+        blocks rendered many times. Mapping-collecting renders still walk.
+        """
+        self._render_fn = compile_block(self)
+
+    def invalidate(self) -> None:
+        """Rebuild cached render state after nodes at or below this block changed.
+
+        Every node below is rebound (child callables, expression resolvers)
+        and blocks that were compiled are compiled again. Generated functions
+        inline nested blocks, so call this on the block that is rendered, not
+        only on the one that was edited.
+        """
+        compiled: list[Block] = []
+        stack: list[Node] = [self]
+        while stack:
+            node = stack.pop()
+            if type(node) is Block and node._render_fn is not None:
+                compiled.append(node)
+            node._bind()
+            stack.extend(_child_nodes(node))
+        for block in compiled:
+            block.compile()
+
+    def _evaluate_nodes(
+        self,
+        context: dict[str, Any],
+        includes: dict[str, "Block"] | None,
+        out: list[Any],
+    ) -> None:
+        """Walk children without a source mapping."""
+        for evaluate in self._eval_fns:
+            if isinstance(evaluate, str):
+                out.append(evaluate)
+            else:
+                evaluate(context, includes, "", None, out)
 
     def __iter__(self):
-        return iter(self.nodes)
+        return iter(self._nodes)
 
     def __len__(self):
-        return len(self.nodes)
+        return len(self._nodes)
 
     def __getitem__(self, idx: int) -> Node:
-        return self.nodes[idx]
+        return self._nodes[idx]
 
     def evaluate(
         self,
@@ -244,23 +503,30 @@ class Block(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> Any:
-        out: list[Any] = []
-        for idx, n in enumerate(self.nodes):
-            v = n.evaluate(context, includes, path + f"/{idx}", mapping)
-            # flatten nested Blocks and For results conservatively
-            if isinstance(v, list):
-                out.extend(v)
-            elif v is None:
-                continue
+        # Children append (flattened) into one shared buffer
+        out: list[Any] = _out if _out is not None else []
+        if mapping is None:
+            render = self._render_fn
+            if render is None:
+                self._evaluate_nodes(context, includes, out)
             else:
-                out.append(v)
-        if mapping is not None:
-            mapping.append((path or "/", self.source_range.start))
+                render(context, includes, out)
+            return out
+        eval_fns = self._eval_fns
+        for segment, evaluate in zip(_child_segments(len(eval_fns)), eval_fns):
+            if isinstance(evaluate, str):
+                out.append(evaluate)
+            else:
+                evaluate(context, includes, path + segment, mapping, out)
+        mapping.append((path or "/", self.start))
         return out
 
 
 class Array(Node):
+    __slots__ = ("_items", "_eval_fns")
+
     def __init__(
         self,
         source_range: "SourceRange",
@@ -269,28 +535,41 @@ class Array(Node):
         super().__init__(source_range)
         self.items = items or []
 
+    @property
+    def items(self) -> list[Node]:
+        return self._items
+
+    @items.setter
+    def items(self, items: list[Node]) -> None:
+        self._items = items
+        self._bind()
+
+    def _bind(self) -> None:
+        self._eval_fns = tuple(it.evaluate for it in self._items)
+
     def evaluate(
         self,
         context: dict[str, Any],
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> list[Any]:
-        out: list[Any] = []
-        for idx, it in enumerate(self.items):
-            v = it.evaluate(context, includes, path + f"/{idx}", mapping)
-            if isinstance(v, list):
-                out.extend(v)
-            elif v is None:
-                continue
-            else:
-                out.append(v)
-        if mapping is not None:
-            mapping.append((path or "/", self.source_range.start))
+        out: list[Any] = _out if _out is not None else []
+        if mapping is None:
+            for evaluate in self._eval_fns:
+                evaluate(context, includes, "", None, out)
+            return out
+        eval_fns = self._eval_fns
+        for segment, evaluate in zip(_child_segments(len(eval_fns)), eval_fns):
+            evaluate(context, includes, path + segment, mapping, out)
+        mapping.append((path or "/", self.start))
         return out
 
 
 class ObjectNode(Node):
+    __slots__ = ("pairs",)
+
     def __init__(
         self,
         source_range: "SourceRange",
@@ -306,27 +585,236 @@ class ObjectNode(Node):
         includes: dict[str, "Block"] | None = None,
         path: str = "",
         mapping: list[tuple[str, Position]] | None = None,
+        _out: list[Any] | None = None,
     ) -> dict[str, Any]:
+        track = mapping is not None
         out: dict[str, Any] = {}
         for key, node in self.pairs:
-            v = node.evaluate(context, includes, path + f"/{key}", mapping)
+            if not track and type(node) is Block:
+                # A Block holding a single Text is a constant: skip evaluating
+                # it into a one-item buffer
+                children = node._nodes
+                if len(children) == 1 and type(children[0]) is Text:
+                    out[key] = children[0].text
+                    continue
+            v = node.evaluate(context, includes, path + f"/{key}" if track else "", mapping)
             # if v is a single-item list, unwrap to scalar
             if isinstance(v, list) and len(v) == 1:
                 out[key] = v[0]
             else:
                 out[key] = v
         if mapping is not None:
-            mapping.append((path or "/", self.source_range.start))
+            mapping.append((path or "/", self.start))
+        if _out is not None:
+            _out.append(out)
         return out
 
 
+def _child_nodes(node: Node) -> list[Node]:
+    """Return the direct child nodes of ``node`` (for AST traversal)."""
+    if type(node) is Block:
+        return node.nodes
+    if type(node) is If:
+        children: list[Node] = [node.body, *(body for _, body in node.else_if_parts)]
+        if node.else_body is not None:
+            children.append(node.else_body)
+        return children
+    if type(node) is For:
+        return [node.body]
+    if type(node) is Array:
+        return node.items
+    if type(node) is ObjectNode:
+        return [value for _, value in node.pairs]
+    return []
+
+
+def link(root: Block, includes: dict[str, Block]) -> None:
+    """Bind every Include reachable from ``root`` to its target Block.
+
+    Linked includes skip the ``includes`` lookup at render time. Targets are
+    linked as well, so nested partials resolve directly too. Relink after
+    changing ``includes``.
+    """
+    seen: set[int] = set()
+    stack: list[Node] = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if type(node) is Include:
+            target = includes.get(node.name)
+            if target is None:
+                raise TemplateError(f"Include not found: {node.name}")
+            node._target = target
+            stack.append(target)
+        else:
+            stack.extend(_child_nodes(node))
+
+
+# Generated code stays well below CPython's limits of 20 statically nested
+# loops and 100 indentation levels; deeper nodes are evaluated as-is.
+_MAX_COMPILED_LOOPS = 16
+_MAX_COMPILED_INDENT = 80
+
+
+class _BlockCompiler:
+    """Lower a Block into the source of one Python render function.
+
+    Text, Expression, Set, If, For and nested Block nodes are emitted inline
+    with the same semantics as their ``evaluate`` methods (mapping-less).
+    Any other node is called through its bound ``evaluate``.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = [
+            "def render(context, includes, out):",
+            "    append = out.append",
+            "    extend = out.extend",
+        ]
+        self.namespace: dict[str, Any] = {"Scope": _Scope}
+        self._counter = 0
+
+    def _fresh(self, prefix: str) -> str:
+        self._counter += 1
+        return f"_{prefix}{self._counter}"
+
+    def _const(self, prefix: str, value: Any) -> str:
+        name = self._fresh(prefix)
+        self.namespace[name] = value
+        return name
+
+    def _emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def body(self, node: Node, ctx: str, indent: int, loops: int) -> None:
+        """Emit ``node`` as a statement body, padding empty bodies with ``pass``."""
+        size = len(self.lines)
+        self.node(node, ctx, indent, loops)
+        if len(self.lines) == size:
+            self._emit(indent, "pass")
+
+    def node(self, node: Node, ctx: str, indent: int, loops: int) -> None:
+        if type(node) is Text:
+            self._emit(indent, f"append({self._const('t', node.text)})")
+        elif type(node) is Expression:
+            is_constant, constant = constant_value(node._resolve_fn)
+            if is_constant:
+                # Literal output is folded into the generated code
+                if constant is not None:
+                    self._emit(indent, f"append({self._const('t', constant)})")
+                return
+            value = self._fresh("v")
+            self._emit(indent, f"{value} = {self._const('r', node._resolve_fn)}({ctx})")
+            self._emit(indent, f"if {value}.__class__ is str:")
+            self._emit(indent + 1, f"append({value})")
+            self._emit(indent, f"elif isinstance({value}, list):")
+            self._emit(indent + 1, f"extend({value})")
+            self._emit(indent, f"elif {value} is not None:")
+            self._emit(indent + 1, f"append({value})")
+        elif type(node) is Set:
+            if node.name:
+                name = self._const("k", node.name)
+                resolve = self._const("r", node._resolve_fn)
+                self._emit(indent, f"{ctx}[{name}] = {resolve}({ctx})")
+        elif indent >= _MAX_COMPILED_INDENT:
+            self._call(node, ctx, indent)
+        elif type(node) is Block:
+            for child in node.nodes:
+                self.node(child, ctx, indent, loops)
+        elif type(node) is If:
+            self._if(node, ctx, indent, loops)
+        elif type(node) is For and loops < _MAX_COMPILED_LOOPS:
+            self._for(node, ctx, indent, loops)
+        else:
+            self._call(node, ctx, indent)
+
+    def _call(self, node: Node, ctx: str, indent: int) -> None:
+        self._emit(indent, f"{self._const('n', node.evaluate)}({ctx}, includes, '', None, out)")
+
+    def _if(self, node: If, ctx: str, indent: int, loops: int) -> None:
+        branches = [
+            (node._cond_expr, node.body),
+            *zip(node._else_if_exprs, (body for _, body in node.else_if_parts)),
+        ]
+        keyword = "if"
+        for cond_expr, body in branches:
+            is_constant, constant = constant_value(cond_expr._resolve_fn)
+            if is_constant:
+                # Literal conditions are decided here: false branches are
+                # dropped and a true one ends the chain like an else.
+                if constant:
+                    self._else(body, ctx, indent, loops, keyword)
+                    return
+                continue
+            cond = self._const("r", cond_expr._resolve_fn)
+            self._emit(indent, f"{keyword} {cond}({ctx}):")
+            self.body(body, ctx, indent + 1, loops)
+            keyword = "elif"
+        if node.else_body:
+            self._else(node.else_body, ctx, indent, loops, keyword)
+
+    def _else(self, body: Node, ctx: str, indent: int, loops: int, keyword: str) -> None:
+        """Emit an unconditional branch, inline when no condition precedes it."""
+        if keyword == "if":
+            self.node(body, ctx, indent, loops)
+        else:
+            self._emit(indent, "else:")
+            self.body(body, ctx, indent + 1, loops)
+
+    def _for(self, node: For, ctx: str, indent: int, loops: int) -> None:
+        iterable, items, length, last_idx, loop_ctx, idx, item = (
+            self._fresh(prefix) for prefix in ("it", "items", "len", "last", "ctx", "i", "x")
+        )
+        var = self._const("k", node.var)
+        self._emit(indent, f"{iterable} = {self._const('r', node._iter_expr._resolve_fn)}({ctx})")
+        self._emit(indent, f"if {iterable} is not None:")
+        inner = indent + 1
+        self._emit(
+            inner,
+            f"{items} = {iterable} if hasattr({iterable}, '__len__') else list({iterable})",
+        )
+        self._emit(inner, f"{length} = len({items})")
+        self._emit(inner, f"{last_idx} = {length} - 1")
+        self._emit(inner, f"{loop_ctx} = Scope({ctx})")
+        self._emit(inner, f"for {idx}, {item} in enumerate({items}):")
+        loop_body = inner + 1
+        self._emit(loop_body, f"{loop_ctx}.clear()")
+        self._emit(loop_body, f"{loop_ctx}[{var}] = {item}")
+        self._emit(
+            loop_body,
+            f'{loop_ctx}["loop"] = {{"index": {idx} + 1, "index0": {idx}, '
+            f'"first": {idx} == 0, "last": {idx} == {last_idx}, "length": {length}}}',
+        )
+        self.node(node.body, loop_ctx, loop_body, loops + 1)
+
+
+def compile_block(block: Block) -> _RenderFn:
+    """Compile ``block`` into one ``render(context, includes, out)`` function.
+
+    The function appends the same output as ``block.evaluate(context,
+    includes)`` without walking the tree node by node. Nested nodes are
+    inlined as they are now; later changes to them are not seen. Blocks too
+    deep to compile fall back to the tree walk.
+    """
+    compiler = _BlockCompiler()
+    try:
+        compiler.body(block, "context", 1, 0)
+        code = compile("\n".join(compiler.lines), f"<temple block {id(block):#x}>", "exec")
+    except (RecursionError, SyntaxError):
+        return block._evaluate_nodes
+    exec(code, compiler.namespace)
+    render: _RenderFn = compiler.namespace["render"]
+    return render
+
+
 # Placeholder classes until they are implemented in typed_ast
 class FunctionDef(Node):
-    pass
+    __slots__ = ()
 
 
 class FunctionCall(Node):
-    pass
+    __slots__ = ()
 
 
 __all__ = [
@@ -343,4 +831,6 @@ __all__ = [
     "TemplateError",
     "FunctionDef",
     "FunctionCall",
+    "compile_block",
+    "link",
 ]
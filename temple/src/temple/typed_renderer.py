@@ -13,13 +13,22 @@ class RenderResult:
 
 
 def evaluate_ast(
-    root: Block, context: Dict[str, Any], includes: Dict[str, Block] | None = None
+    root: Block,
+    context: Dict[str, Any],
+    includes: Dict[str, Block] | None = None,
+    *,
+    collect_mapping: bool = True,
 ) -> RenderResult:
     """Evaluate AST to a target-neutral IR and collect a trivial mapping of node types to positions.
 
     Mapping is a list of (node_type, start) tuples for nodes that expose `start`.
+    With ``collect_mapping=False`` the mapping is left empty and the root is
+    rendered untraced (through its generated function if ``root.compile()``
+    was called).
     """
     mapping: List[Tuple[str, Tuple[int, int]]] = []
+    if not collect_mapping:
+        return RenderResult(root.evaluate(context, includes), mapping)
     # Evaluate root with path-aware mapping propagation
     ir = root.evaluate(context, includes, path="/", mapping=mapping)
     return RenderResult(ir, mapping)
@@ -30,28 +39,27 @@ def json_serialize(ir: Any) -> str:
 
 
 def markdown_serialize(ir: Any) -> str:
-    # Naive serializer: concatenate string-like leaves, join lists with newlines
-    def _flatten(x: Any) -> List[str]:
+    # Naive serializer: concatenate string-like leaves, join lists with newlines.
+    # Leaves are collected with an explicit stack so deeply nested IR cannot
+    # hit the recursion limit; children are pushed reversed to keep order.
+    parts: List[str] = []
+    append = parts.append
+    stack: List[Any] = [ir]
+    while stack:
+        x = stack.pop()
         if x is None:
-            return []
+            continue
         if isinstance(x, str):
-            return [x]
-        if isinstance(x, (int, float)):
-            return [str(x)]
-        if isinstance(x, list):
-            out: List[str] = []
-            for i in x:
-                out.extend(_flatten(i))
-            return out
-        if isinstance(x, dict):
+            append(x)
+        elif isinstance(x, (int, float)):
+            append(str(x))
+        elif isinstance(x, list):
+            stack.extend(reversed(x))
+        elif isinstance(x, dict):
             # prefer values
-            out: List[str] = []
-            for v in x.values():
-                out.extend(_flatten(v))
-            return out
-        return [str(x)]
-
-    parts = _flatten(ir)
+            stack.extend(reversed(x.values()))
+        else:
+            append(str(x))
     return "\n\n".join(parts)
 
 
@@ -2,22 +2,20 @@
 
 from __future__ import annotations
 
-import re
-
 TRIM_MARKERS = frozenset({"-", "~"})
 
-LEADING_WHITESPACE_RE = re.compile(r"^[ \t\r\n]+")
-TRAILING_WHITESPACE_RE = re.compile(r"[ \t\r\n]+$")
+# Characters removed by trim markers; str.lstrip/rstrip strip them in C
+TRIM_WHITESPACE = " \t\r\n"
 
 
 def trim_leading_whitespace(text: str) -> str:
     """Remove leading horizontal/vertical whitespace from text."""
-    return LEADING_WHITESPACE_RE.sub("", text)
+    return text.lstrip(TRIM_WHITESPACE)
 
 
 def trim_trailing_whitespace(text: str) -> str:
     """Remove trailing horizontal/vertical whitespace from text."""
-    return TRAILING_WHITESPACE_RE.sub("", text)
+    return text.rstrip(TRIM_WHITESPACE)
 
 
 def apply_left_trim(chunks: list[str]) -> None:
@@ -47,11 +45,11 @@ def parse_token_trim_markers(
     trim_left = False
     trim_right = False
 
-    if content_start < content_end and is_trim_marker(raw_token[content_start]):
+    if content_start < content_end and raw_token[content_start] in TRIM_MARKERS:
         trim_left = True
         content_start += 1
 
-    if content_end > content_start and is_trim_marker(raw_token[content_end - 1]):
+    if content_end > content_start and raw_token[content_end - 1] in TRIM_MARKERS:
         trim_right = True
         content_end -= 1
 
@@ -84,3 +84,34 @@ def test_iter_ir_nodes_walks_nested_blocks() -> None:
 
     kinds = [type(node).__name__ for node in iter_ir_nodes(result.ir)]
     assert kinds == ["IRText", "IRExpression", "IRStatement", "IRExpression"]
+
+
+def test_ir_nodes_use_slots() -> None:
+    node = IRText(value="x", source_range=_sr(0, 0, 1))
+
+    assert not hasattr(node, "__dict__")
+    assert node == IRText(value="x", source_range=_sr(0, 0, 1))
+
+
+def test_iter_ir_nodes_handles_deep_nesting() -> None:
+    depth = 5000
+    block = IRBlock(nodes=(IRText(value="leaf", source_range=_sr(0, 0, 4)),), source_range=_sr(0, 0, 4))
+    for _ in range(depth):
+        block = IRBlock(
+            nodes=(IRStatement(kind="if", args={"body": [block]}, source_range=_sr(0, 0, 4)),),
+            source_range=_sr(0, 0, 4),
+        )
+
+    nodes = iter_ir_nodes(block)
+    assert len(nodes) == depth + 1
+    assert isinstance(nodes[-1], IRText)
+
+
+def test_ir_statements_with_dict_args_are_hashable() -> None:
+    adapter = _FakeAdapter()
+    result = adapter.parse_to_ir("ignored")
+
+    statement = result.ir.nodes[2]
+    assert isinstance(statement, IRStatement)
+    assert hash(statement) == hash(adapter.parse_to_ir("ignored").ir.nodes[2])
+    assert len({result.ir, adapter.parse_to_ir("ignored").ir}) == 1
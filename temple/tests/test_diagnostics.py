@@ -2,6 +2,8 @@
 Tests for the diagnostic system (ported from compiler tests).
 """
 
+import pytest
+
 from temple.diagnostics import (
     Diagnostic,
     DiagnosticSeverity,
@@ -9,6 +11,7 @@ from temple.diagnostics import (
     Position,
     SourceRange,
 )
+from temple.range_utils import make_source_range
 
 
 class TestPosition:
@@ -48,6 +51,18 @@ class TestSourceRange:
             "end": {"line": 0, "character": 10},
         }
 
+    def test_make_source_range_normalizes_inputs(self):
+        range = SourceRange(Position(0, 5), Position(0, 10))
+        assert make_source_range(range) is range
+        assert make_source_range(start=(1, 2)) == SourceRange(Position(1, 2), Position(1, 2))
+        assert make_source_range(start=[1, 2], end=(3, 4)) == SourceRange(
+            Position(1, 2), Position(3, 4)
+        )
+        with pytest.raises(TypeError, match="start"):
+            make_source_range(start=(1, "2"))
+        with pytest.raises(TypeError, match="end"):
+            make_source_range(start=(1, 2), end=(3,))
+
 
 class TestDiagnostic:
     """Test Diagnostic class."""
@@ -0,0 +1,27 @@
+from types import MappingProxyType
+
+from temple.expression_eval import _compile_path, evaluate_expression, resolve_simple_path
+
+
+def test_resolve_simple_path_accepts_non_dict_contexts() -> None:
+    assert resolve_simple_path("0", [10, 20]) == 10
+    assert resolve_simple_path("1.name", ({"name": "a"}, {"name": "b"})) == "b"
+    assert resolve_simple_path("5", [10, 20]) is None
+    assert resolve_simple_path("a.b", MappingProxyType({"a": {"b": 1}})) == 1
+    assert resolve_simple_path("a", "text") is None
+    assert resolve_simple_path("a.0", 3) is None
+    assert resolve_simple_path("a", None) is None
+
+
+def test_expression_paths_resolve_missing_segments_to_none() -> None:
+    context = {"user": {"tags": ["x"]}}
+    assert evaluate_expression("user.tags.0", context) == "x"
+    assert evaluate_expression("user.tags.3", context) is None
+    assert evaluate_expression("user.name.first", context) is None
+
+
+def test_resolve_simple_path_reuses_compiled_path() -> None:
+    _compile_path.cache_clear()
+    for value in (1, 2):
+        assert resolve_simple_path("a.b.0", {"a": {"b": [value]}}) == value
+    assert _compile_path.cache_info().hits == 1
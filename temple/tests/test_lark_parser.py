@@ -1,4 +1,4 @@
-from temple.lark_parser import parse_template
+from temple.lark_parser import get_parser, parse_template
 
 
 def test_parse_simple_expression_and_text():
@@ -25,3 +25,10 @@ Inactive
     # ensure parsing succeeds and returns a block
     assert root is not None
     assert len(root.nodes) >= 2
+
+
+def test_get_parser_is_cached():
+    assert get_parser() is get_parser()
+    # the shared plain parser still returns raw trees, not typed AST
+    tree = get_parser().parse("Hi {{ name }}")
+    assert tree.data == "start"
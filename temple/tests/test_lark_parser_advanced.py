@@ -2,9 +2,22 @@
 Advanced tests for lark_parser with error handling (ported from compiler tests).
 """
 
+import os
+import stat
+
+import pytest
+from lark import Transformer
+
 from temple.diagnostics import DiagnosticSeverity
-from temple.lark_parser import parse_template, parse_with_diagnostics
-from temple.typed_ast import Block, Expression, For, If, Include, Text
+from temple.lark_parser import (
+    _parser_cache_path,
+    clear_parser_cache,
+    get_parser,
+    parse_many,
+    parse_template,
+    parse_with_diagnostics,
+)
+from temple.typed_ast import Block, Expression, For, If, Include, Set, Text
 
 
 class TestParseTemplate:
@@ -18,6 +31,23 @@ class TestParseTemplate:
         assert isinstance(ast.nodes[0], Text)
         assert ast.nodes[0].text == "hello world"
 
+    def test_parse_empty_template(self):
+        """Empty input yields an empty Block and matching raw tree."""
+        ast = parse_template("")
+        assert isinstance(ast, Block)
+        assert ast.nodes == []
+
+        ast, tree = parse_template("", include_raw=True)
+        assert ast.nodes == []
+        assert tree.data == "start"
+        assert [child.data for child in tree.children] == ["block"]
+
+    def test_parse_whitespace_only_template_keeps_text(self):
+        """Whitespace-only input is still parsed into a Text node."""
+        ast = parse_template("  \n")
+        assert len(ast.nodes) == 1
+        assert ast.nodes[0].text == "  \n"
+
     def test_parse_expression(self):
         """Parse {{ expression }}."""
         ast = parse_template("value: {{ user.name }}")
@@ -62,6 +92,14 @@ class TestParseTemplate:
         assert len(if_node.else_if_parts) == 1
         assert if_node.else_if_parts[0][0] == "y"
 
+    def test_parse_else_if_with_trim_markers(self):
+        """Trim markers around else-if tags are not part of the condition."""
+        template = "{% if x %}a{%- elif y and z ~%}b{%~ else  if w -%}c{% end %}"
+        ast = parse_template(template)
+        if_node = ast.nodes[0]
+        assert isinstance(if_node, If)
+        assert [cond for cond, _ in if_node.else_if_parts] == ["y and z", "w"]
+
     def test_parse_for_loop(self):
         """Parse {% for %} ... {% end %}."""
         template = "{% for item in items %}{{ item }}{% end %}"
@@ -85,6 +123,28 @@ class TestParseTemplate:
         assert isinstance(include_node, Include)
         assert include_node.name == "header.tmpl"
 
+    def test_parse_tree_path_matches_default_path(self):
+        """Transforming the raw tree yields the same AST as the fused parse."""
+        template = "{% if a %}{{ b }}{% elif c %}{% include 'x' %}{% else %}{% set d = e %}{% end %}"
+        for ast in (parse_template(template), parse_template(template, include_raw=True)[0]):
+            if_node = ast.nodes[0]
+            assert isinstance(if_node, If)
+            assert if_node.condition == "a"
+            assert isinstance(if_node.body.nodes[0], Expression)
+            cond, elif_body = if_node.else_if_parts[0]
+            assert cond == "c"
+            assert isinstance(elif_body.nodes[0], Include)
+            assert elif_body.nodes[0].name == "x"
+            assert isinstance(if_node.else_body.nodes[0], Set)
+
+    def test_parse_drops_invalid_set_statement(self):
+        """An unparseable set statement leaves no node in its block."""
+        ast = parse_template("a{% set 1x %}b")
+        assert [node.text for node in ast.nodes] == ["a", "b"]
+
+        _ast, diagnostics = parse_with_diagnostics("a{% set 1x %}b")
+        assert [d.code for d in diagnostics] == ["INVALID_SET_STATEMENT"]
+
     def test_parse_nested_structures(self):
         """Parse nested if/for."""
         template = "{% if show %}{% for item in list %}{{ item }}{% end %}{% end %}"
@@ -98,6 +158,69 @@ class TestParseTemplate:
         assert isinstance(for_node, For)
 
 
+class TestParseMany:
+    """Test parse_many function."""
+
+    def test_parse_many_preserves_order(self):
+        """Each input text maps to its own Block, in input order."""
+        texts = ["hello", "", "{{ user.name }}", "{% if x %}y{% end %}"]
+        asts = parse_many(texts)
+        assert len(asts) == 4
+        assert asts[0].nodes[0].text == "hello"
+        assert asts[1].nodes == []
+        assert asts[2].nodes[0].expr == "user.name"
+        assert isinstance(asts[3].nodes[0], If)
+
+    def test_parse_many_with_thread_pool(self):
+        """Threaded parsing returns the same results in input order."""
+        texts = [f"{{{{ item{i} }}}}" for i in range(20)]
+        asts = parse_many(texts, max_workers=4)
+        assert [ast.nodes[0].expr for ast in asts] == [f"item{i}" for i in range(20)]
+
+
+class TestParserReuse:
+    """Test that the built parser is shared between calls."""
+
+    def test_get_parser_is_reused_until_cleared(self):
+        """Repeated calls return one parser; clearing the cache rebuilds it."""
+        parser = get_parser()
+        assert get_parser() is parser
+        clear_parser_cache()
+        rebuilt = get_parser()
+        assert rebuilt is not parser
+        assert parse_template("{{ x }}").nodes[0].expr == "x"
+
+    def test_custom_transformer_parsers_are_not_cached(self):
+        """A caller's transformer gets a fresh parser and leaves the shared ones alone."""
+        parser = get_parser()
+        custom = get_parser(transformer=Transformer())
+        assert custom is not parser
+        assert get_parser(transformer=Transformer()) is not custom
+        assert get_parser() is parser
+
+
+class TestParserCachePath:
+    """Test where the pickled LALR tables are stored."""
+
+    def test_cache_lives_in_private_user_directory(self, tmp_path, monkeypatch):
+        """The cache file sits in a per-user directory only its owner can access."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        path = _parser_cache_path("start: NAME")
+        assert path is not None
+        assert os.path.dirname(path) == str(tmp_path / "temple")
+        assert stat.S_IMODE(os.stat(tmp_path / "temple").st_mode) & 0o077 == 0
+        assert _parser_cache_path("start: NAME") == path
+        assert _parser_cache_path("start: WORD") != path
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_cache_is_skipped_for_writable_shared_directory(self, tmp_path, monkeypatch):
+        """A cache directory writable by others disables the disk cache."""
+        (tmp_path / "temple").mkdir()
+        os.chmod(tmp_path / "temple", 0o777)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert _parser_cache_path("start: NAME") is None
+
+
 class TestParseWithDiagnostics:
     """Test parse_with_diagnostics function."""
 
@@ -166,6 +289,29 @@ class TestParseWithDiagnostics:
         # Should have at least one error
         assert len(diagnostics) > 0
 
+    def test_deeply_nested_template_has_no_diagnostics(self):
+        """Deep nesting is transformed without exhausting the Python stack."""
+        depth = 1500
+        template = "{% if x %}" * depth + "y" + "{% end %}" * depth
+        ast, diagnostics = parse_with_diagnostics(template)
+
+        assert diagnostics == ()
+        node = ast.nodes[0]
+        for _ in range(depth - 1):
+            node = node.body.nodes[0]
+        assert node.body.nodes[0].text == "y"
+
+    def test_invalid_expression_positions_span_lines(self):
+        """Pre-scan diagnostics report line/column for each invalid expression."""
+        template = "a\nb {{ x. }}\n\n  {{ .y }}"
+        ast, diagnostics = parse_with_diagnostics(template)
+
+        prescan = [d for d in diagnostics if d.code == "INVALID_EXPRESSION"]
+        assert [(d.source_range.start.line, d.source_range.start.column) for d in prescan] == [
+            (1, 2),
+            (3, 2),
+        ]
+
     def test_valid_complex_template(self):
         """Complex but valid template should parse cleanly."""
         template = """
@@ -45,3 +45,16 @@ def test_schema_type_mismatch():
     schema = {"type": "object", "properties": {"name": {"type": "string"}}}
     diags = validate(res.ir, schema, mapping=res.mapping)
     assert any("expected string" in d["message"] for d in diags)
+
+
+def test_schema_validates_deeply_nested_ir_without_recursion():
+    depth = 5000
+    ir: object = "leaf"
+    schema: dict = {"type": "number"}
+    for _ in range(depth):
+        ir = [ir]
+        schema = {"type": "array", "items": schema}
+    diags = validate(ir, schema)
+    assert len(diags) == 1
+    assert diags[0]["path"] == "/0" * depth
+    assert diags[0]["message"] == "expected number, got str"
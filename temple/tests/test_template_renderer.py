@@ -1,4 +1,8 @@
-from temple.template_renderer import render_passthrough
+from temple.template_renderer import (
+    _render_passthrough_cached,
+    clear_render_cache,
+    render_passthrough,
+)
 
 
 def test_render_passthrough_expression_trim_markers_strip_surrounding_whitespace():
@@ -35,3 +39,21 @@ def test_render_passthrough_does_not_leak_trim_right_across_template_tokens():
 
     assert errors == []
     assert rendered == "A   B"
+
+
+def test_render_passthrough_caches_results_per_text_and_delimiters():
+    clear_render_cache()
+    template = "x{% if a %}y"
+
+    first = render_passthrough(template)
+    first[1].append("caller mutation")
+    second = render_passthrough(template)
+
+    assert second == ("xy", ["Unclosed block 'if' at line 1, col 2"])
+    assert _render_passthrough_cached.cache_info().hits == 1
+
+    custom = render_passthrough("x<% if a %>y", {"statement": ("<%", "%>")})
+    assert custom == ("xy", ["Unclosed block 'if' at line 1, col 2"])
+
+    clear_render_cache()
+    assert _render_passthrough_cached.cache_info().currsize == 0
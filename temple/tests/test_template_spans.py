@@ -1,6 +1,11 @@
 from temple.template_spans import (
+    _build_template_metadata_cached,
+    build_line_metadata,
     build_template_metadata,
+    build_token_span_index,
+    build_token_spans,
     build_unclosed_span,
+    clear_template_metadata_cache,
     find_token_span_at_offset,
 )
 
@@ -41,3 +46,37 @@ def test_find_token_span_at_offset_uses_content_range() -> None:
 
     assert span is not None
     assert span.token.type == "expression"
+
+
+def test_build_template_metadata_reuses_cached_result() -> None:
+    clear_template_metadata_cache()
+    text = "a {{ b }}\n"
+    first_spans, first_lines = build_template_metadata(text)
+    first_spans.clear()
+
+    second_spans, second_lines = build_template_metadata(text)
+
+    assert [span.token.type for span in second_spans] == ["text", "expression", "text"]
+    assert second_lines == first_lines
+    assert _build_template_metadata_cached.cache_info().hits == 1
+
+
+def test_build_token_spans_matches_template_metadata_spans() -> None:
+    text = "{% if x %}\n  {{ y }}\n{% end %}"
+    token_spans = build_token_spans(text)
+    expected_spans, expected_lines = build_template_metadata(text)
+
+    assert token_spans == expected_spans
+    assert build_line_metadata(text, token_spans) == expected_lines
+
+
+def test_token_span_index_matches_linear_lookup() -> None:
+    text = "a {{ b }} c {% if d %}{{e}}{% end %} {{ f"
+    token_spans = build_token_spans(text)
+    index = build_token_span_index(text)
+
+    for token_type in ("expression", "statement", "text", "comment"):
+        for offset in range(len(text) + 1):
+            assert find_token_span_at_offset(
+                index, offset, token_type
+            ) == find_token_span_at_offset(token_spans, offset, token_type)
@@ -160,3 +160,33 @@ def test_pattern_caching():
     assert len(tokens5) == 1
     assert _compile_token_pattern.cache_info().hits == 3
     assert _compile_token_pattern.cache_info().misses == 2
+
+
+def test_tokens_carry_absolute_offsets():
+    text = "a\n{{ b }}\nc{% end %}"
+    tokens = list(temple_tokenizer(text))
+    assert [(t.start_offset, t.end_offset) for t in tokens] == [
+        (0, 2),
+        (2, 9),
+        (9, 11),
+        (11, 20),
+    ]
+    assert all(text[t.start_offset : t.end_offset] == t.raw_token for t in tokens)
+    assert Token("x", (0, 0)).start_offset is None
+
+
+def test_token_ends_at_first_full_close_delimiter():
+    text = "{{ a } b %}}}{% c % } %}"
+    tokens = list(temple_tokenizer(text))
+    assert [(t.type, t.raw_token) for t in tokens] == [
+        ("expression", "{{ a } b %}}"),
+        ("text", "}"),
+        ("statement", "{% c % } %}"),
+    ]
+
+
+def test_token_types_are_interned():
+    tokens = list(temple_tokenizer("a{{ b }}{% c %}{# d #}"))
+    expected = ["text", "expression", "statement", "comment"]
+    assert [t.type for t in tokens] == expected
+    assert all(t.type is name for t, name in zip(tokens, expected))
@@ -1,6 +1,8 @@
 import json
 
-from temple.typed_ast import Block, Text, Expression, For
+from temple.typed_ast import (
+    Array, Block, Text, Expression, For, If, Include, Set, compile_block, link
+)
 from temple.diagnostics import Position, SourceRange
 from temple.typed_renderer import evaluate_ast, json_serialize, markdown_serialize
 
@@ -32,8 +34,230 @@ def test_for_loop_and_markdown():
     assert "List:" in md and "a" in md and "b" in md
 
 
+def test_for_loop_scope_does_not_leak_into_context():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    body = Block(
+        [
+            Expression(sr, "x.name"),
+            Expression(sr, "seen"),
+            Set(sr, "seen", "x.name"),
+            Expression(sr, "loop.index"),
+        ]
+    )
+    ctx = {"items": [{"name": "a"}, {"name": "b"}]}
+    res = evaluate_ast(Block([For(sr, "x", "items", body)]), ctx)
+    assert res.ir == ["a", 1, "b", 2]
+    assert ctx == {"items": [{"name": "a"}, {"name": "b"}]}
+
+
+def test_if_reuses_condition_expressions_across_renders():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    node = If(
+        sr,
+        "user.tags.0 == 'admin'",
+        Block([Text(sr, "admin")]),
+        else_if_parts=[("user.tags.0 == 'dev'", Block([Text(sr, "tagged")]))],
+        else_body=Block([Text(sr, "none")]),
+    )
+    root = Block([node])
+    assert evaluate_ast(root, {"user": {"tags": ["admin"]}}).ir == ["admin"]
+    assert evaluate_ast(root, {"user": {"tags": ["dev"]}}).ir == ["tagged"]
+    assert evaluate_ast(root, {"user": {"tags": []}}).ir == ["none"]
+
+
+def test_block_keeps_adjacent_text_nodes():
+    root = Block(
+        [
+            Text(SourceRange(Position(0, 0), Position(0, 2)), "a "),
+            Text(SourceRange(Position(0, 9), Position(0, 11)), "b "),
+            Expression(SourceRange(Position(0, 11), Position(0, 18)), "x"),
+            Text(SourceRange(Position(0, 18), Position(0, 19)), "c"),
+        ]
+    )
+    assert [n.text for n in root.nodes if isinstance(n, Text)] == ["a ", "b ", "c"]
+    assert evaluate_ast(root, {"x": 1}).ir == ["a ", "b ", 1, "c"]
+
+
+def test_for_loop_helpers_cover_unsized_iterables():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    body = Block([Expression(sr, "loop.last"), Expression(sr, "loop.length")])
+    root = Block([For(sr, "x", "items", body)])
+    res = evaluate_ast(root, {"items": (n for n in "ab")})
+    assert res.ir == [False, 2, True, 2]
+
+
+def test_for_loop_helper_is_a_fresh_mapping_per_iteration():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    root = Block([For(sr, "x", "items", Block([Expression(sr, "loop")]))])
+    res = evaluate_ast(root, {"items": ["a", "b"]})
+    assert [(helper["index"], helper["first"], helper["last"]) for helper in res.ir] == [
+        (1, True, False),
+        (2, False, True),
+    ]
+
+
+def test_compiled_block_matches_tree_walk():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    body = Block(
+        [
+            Expression(sr, "x.name"),
+            If(
+                sr,
+                "loop.last",
+                Block([Text(sr, ".")]),
+                else_if_parts=[("x.tags", Block([Expression(sr, "x.tags")]))],
+                else_body=Block([Text(sr, ",")]),
+            ),
+        ]
+    )
+    root = Block(
+        [Set(sr, "title", "heading"), Expression(sr, "title"), For(sr, "x", "items", body)]
+    )
+    context = {
+        "heading": "H",
+        "items": [{"name": "a", "tags": ["t1", "t2"]}, {"name": "b"}, {"name": "c"}],
+    }
+    walked: list = []
+    root._evaluate_nodes(dict(context), None, walked)
+    rendered: list = []
+    compile_block(root)(dict(context), None, rendered)
+    assert rendered == walked == ["H", "a", "t1", "t2", "b", ",", "c", "."]
+    assert root.evaluate(dict(context)) == walked
+
+
+def test_block_renders_through_generated_function_only_when_compiled():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    root = Block([Text(sr, "a"), For(sr, "x", "items", Block([Expression(sr, "x")]))])
+    assert root.evaluate({"items": [1]}) == ["a", 1]
+    assert root._render_fn is None
+    root.compile()
+    assert root._render_fn is not None
+    assert root.evaluate({"items": [1, 2]}) == ["a", 1, 2]
+    assert evaluate_ast(root, {"items": [1]}, collect_mapping=False).ir == ["a", 1]
+    root.nodes = [Text(sr, "b")]
+    assert root._render_fn is None
+    assert root.evaluate({}) == ["b"]
+
+
+def test_link_binds_includes_for_rendering_without_the_map():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    leaf = Block([Text(sr, "leaf")])
+    partial = Block([Text(sr, "<"), Include(sr, "leaf"), Text(sr, ">")])
+    root = Block([For(sr, "x", "items", Block([Include(sr, "partial")]))])
+    link(root, {"partial": partial, "leaf": leaf})
+    assert root.evaluate({"items": [1, 2]}) == ["<", "leaf", ">", "<", "leaf", ">"]
+
+
+def test_nested_loop_scopes_fall_back_to_enclosing_scopes():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    inner = For(sr, "y", "x.kids", Block([Expression(sr, "x.name"), Expression(sr, "y")]))
+    root = Block([For(sr, "x", "rows", Block([inner, Expression(sr, "title")]))])
+    context = {"title": "T", "rows": [{"name": "a", "kids": [1, 2]}, {"name": "b", "kids": []}]}
+    assert root.evaluate(context) == ["a", 1, "a", 2, "T", "T"]
+    assert evaluate_ast(root, context).ir == ["a", 1, "a", 2, "T", "T"]
+
+
+def test_evaluate_ast_without_mapping_matches_traced_output():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    root = Block([Text(sr, "Hi "), For(sr, "x", "items", Block([Expression(sr, "x")]))])
+    traced = evaluate_ast(root, {"items": [1, 2]})
+    fast = evaluate_ast(root, {"items": [1, 2]}, collect_mapping=False)
+    assert fast.ir == traced.ir == ["Hi ", 1, 2]
+    assert fast.mapping == [] and traced.mapping
+
+
+def test_compiled_block_folds_literal_conditions_and_output():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    root = Block(
+        [
+            If(sr, "0", Block([Text(sr, "never")]), [("x", Block([Text(sr, "x")]))]),
+            If(sr, "1", Block([Expression(sr, "'on'")]), else_body=Block([Text(sr, "off")])),
+            Expression(sr, "42"),
+        ]
+    )
+    walked: list = []
+    root._evaluate_nodes({"x": True}, None, walked)
+    root.compile()
+    assert root.evaluate({"x": True}) == walked == ["x", "on", 42]
+    assert root.evaluate({}) == ["on", 42]
+
+
+def test_markdown_serialize_handles_deeply_nested_ir():
+    ir: list = ["leaf"]
+    for _ in range(5000):
+        ir = [ir, {"k": 1}]
+    md = markdown_serialize(["head", ir])
+    assert md.startswith("head\n\nleaf\n\n1")
+    assert md.count("\n\n") == 5001
+
+
+def test_invalidate_picks_up_mutated_nested_blocks():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    inner = Block([Text(sr, "a")])
+    root = Block([For(sr, "x", "items", inner)])
+    assert root.evaluate({"items": [1]}) == ["a"]
+    inner.nodes.append(Expression(sr, "x"))
+    root.invalidate()
+    assert root.evaluate({"items": [1]}) == ["a", 1]
+    assert evaluate_ast(root, {"items": [1]}).ir == ["a", 1]
+
+
+def test_invalidate_rebuilds_compiled_render_after_node_edits():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    cond = If(sr, "x", Block([Text(sr, "A")]))
+    value = Expression(sr, "i")
+    loop = For(sr, "i", "items", Block([value]))
+    items = Array(sr, [Expression(sr, "x")])
+    root = Block([cond, loop, items])
+    root.compile()
+    context = {"x": 1, "y": 0, "items": [2, 3]}
+    assert root.evaluate(dict(context)) == ["A", 2, 3, 1]
+
+    cond.condition = "y"
+    loop.var = "j"
+    value.expr = "j * 10"
+    items.items.append(Text(sr, "z"))
+    root.invalidate()
+    assert root._render_fn is not None
+    assert root.evaluate(dict(context)) == [20, 30, 1, "z"]
+    assert evaluate_ast(root, dict(context)).ir == [20, 30, 1, "z"]
+
+
+def test_assigning_block_nodes_rebinds_render_state():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    block = Block([Text(sr, "a")])
+    assert block.evaluate({"x": 1}) == ["a"]
+    block.nodes = [Expression(sr, "x")]
+    assert block.evaluate({"x": 1}) == [1]
+    assert block.body is block.nodes
+    block.body = [Text(sr, "b"), Expression(sr, "x")]
+    assert block.evaluate({"x": 1}) == ["b", 1]
+    assert block.nodes is block.body
+
+
 # precommit test
 
 # precommit test
 
 # precommit test
+
+
+def test_assigning_expression_sources_rebuilds_resolvers():
+    sr = SourceRange(Position(0, 0), Position(0, 1))
+    expr = Expression(sr, "x")
+    cond = If(sr, "x", Block([Text(sr, "A"), expr]), [("y", Block([Text(sr, "B")]))])
+    loop = For(sr, "i", "items", Block([Expression(sr, "i")]))
+    assign = Set(sr, "z", "x")
+    root = Block([cond, loop, assign, Expression(sr, "z")])
+    context = {"x": 1, "y": 2, "items": [3], "other": [4]}
+    assert evaluate_ast(root, dict(context)).ir == ["A", 1, 3, 1]
+
+    cond.condition = "nope"
+    cond.else_if_parts = [("nope", Block([Text(sr, "B")]))]
+    loop.iterable = "other"
+    assign.expr = "y"
+    assert evaluate_ast(root, dict(context)).ir == [4, 2]
+
+    cond.condition = "x"
+    expr.expr = "y"
+    assert evaluate_ast(root, dict(context)).ir == ["A", 2, 4, 2]
@@ -1,4 +1,4 @@
-from temple.typed_ast import ObjectNode, Array, Expression
+from temple.typed_ast import ObjectNode, Array, Block, Expression, Text
 from temple.diagnostics import Position, SourceRange
 from temple.typed_renderer import evaluate_ast, json_serialize
 
@@ -21,3 +21,38 @@ def test_object_and_array_serialization():
     # JSON serialize
     js = json_serialize(res.ir)
     assert "Alice" in js
+
+
+def test_object_unwraps_single_item_lists():
+    sr = SourceRange(Position(0, 0), Position(0, 0))
+    obj = ObjectNode(
+        sr,
+        [
+            ("title", Block([Text(sr, "Hello")])),
+            ("tag", Expression(sr, "user.tag")),
+            ("tags", Expression(sr, "user.tags")),
+        ],
+    )
+    res = evaluate_ast(obj, {"user": {"tag": ["solo"], "tags": ["a", "b"]}})
+    assert res.ir == {"title": "Hello", "tag": "solo", "tags": ["a", "b"]}
+    assert obj.evaluate({"user": {"tag": ["solo"], "tags": ["a", "b"]}}) == res.ir
+
+
+def test_object_constant_text_value_matches_with_and_without_mapping():
+    sr = SourceRange(Position(0, 0), Position(0, 0))
+    obj = ObjectNode(sr, [("title", Block([Text(sr, "Hello")])), ("empty", Block([]))])
+    assert obj.evaluate({}) == {"title": "Hello", "empty": []}
+    assert evaluate_ast(obj, {}).ir == {"title": "Hello", "empty": []}
+
+
+def test_object_constant_text_value_follows_edits():
+    sr = SourceRange(Position(0, 0), Position(0, 0))
+    title = Text(sr, "Hello")
+    value = Block([title])
+    obj = ObjectNode(sr, [("title", value)])
+    assert obj.evaluate({}) == {"title": "Hello"}
+    title.text = "Bye"
+    assert obj.evaluate({}) == {"title": "Bye"}
+    value.nodes = [Text(sr, "a"), Text(sr, "b")]
+    assert obj.evaluate({}) == {"title": ["a", "b"]}
+    assert evaluate_ast(obj, {}).ir == {"title": ["a", "b"]}